@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Catalog Pagination Benchmark
+Round trips and wall time to fetch a large creator's catalog, before and after pipelined paging
+
+"before" is the previous pager: 30 items per page, each page requested only after the
+previous one was processed. "after" is the current default: the largest accepted page
+size and the next page requested as soon as its cursor is known. Both walk the whole
+catalog (the item cap is lifted) against a local stub Roblox server with the default
+request spacing, and every page costs --process-ms of simulated work in the consumer.
+
+Run from the DiscordPyBot directory:
+    python benchmarks/bench_catalog_pagination.py
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_event_loop import wait_for_server
+from rate_limiter import Priority
+from roblox_api import RobloxAPI
+from stub_roblox import use_stub
+
+CATALOG_SIZE = 1000
+CREATORS = 5
+
+CONFIGURATIONS = {
+    'before': {'catalog_page_size': 30, 'catalog_prefetch': False},
+    'no prefetch': {'catalog_prefetch': False},
+    'after': {}
+}
+
+async def run_configuration(base_url: str, settings: dict, creators: int, process: float) -> dict:
+    roblox_api = RobloxAPI()
+    use_stub(roblox_api, base_url)
+    roblox_api.max_catalog_items = 10 ** 9
+    for name, value in settings.items():
+        setattr(roblox_api, name, value)
+    
+    elapsed = []
+    items = 0
+    try:
+        for user_id in range(1, creators + 1):
+            started = time.perf_counter()
+            async for page in roblox_api._walk_catalog_pages(user_id, Priority.INTERACTIVE, None):
+                items += len(page)
+                await asyncio.sleep(process)
+            elapsed.append(time.perf_counter() - started)
+    finally:
+        await roblox_api.close()
+    
+    stats = roblox_api.pagination_stats
+    return {
+        'page_size': roblox_api.catalog_page_size,
+        'round_trips': stats['round_trips'] / creators,
+        'items': items / creators,
+        'seconds': sum(elapsed) / creators
+    }
+
+async def run_all(base_url: str, creators: int, process: float):
+    results = {}
+    for name, settings in CONFIGURATIONS.items():
+        results[name] = await run_configuration(base_url, settings, creators, process)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--catalog-size', type=int, default=CATALOG_SIZE, help="Gamepasses per creator")
+    parser.add_argument('--creators', type=int, default=CREATORS)
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--latency-ms', type=float, default=80.0, help="Stub server response delay")
+    parser.add_argument('--process-ms', type=float, default=20.0, help="Simulated work per page")
+    args = parser.parse_args()
+    
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen([sys.executable, os.path.join(BENCH_DIR, 'stub_roblox.py'), '--port', str(args.port),
+                               '--latency-ms', str(args.latency_ms), '--catalog-size', str(args.catalog_size)])
+    try:
+        wait_for_server(base_url)
+        print(f"{args.creators} creators with {args.catalog_size} gamepasses, stub latency {args.latency_ms}ms, "
+              f"{args.process_ms}ms processing per page")
+        results = asyncio.run(run_all(base_url, args.creators, args.process_ms / 1000))
+        
+        baseline = results['before']
+        for name, result in results.items():
+            print(f"{name:<11} page size {result['page_size']:>3}  {result['round_trips']:5.1f} round trips  "
+                  f"{result['items']:6.0f} items  {result['seconds'] * 1000:7.0f} ms per creator  "
+                  f"({baseline['seconds'] / result['seconds']:.2f}x)")
+    finally:
+        server.terminate()
+        server.wait()
+
+if __name__ == "__main__":
+    main()
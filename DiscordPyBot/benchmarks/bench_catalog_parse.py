@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Catalog Parsing Benchmark
+CPU time per 1,000 catalog items: stdlib decode + dict copy (before) vs json_codec (after)
+
+Run from the DiscordPyBot directory:
+    python benchmarks/bench_catalog_parse.py
+"""
+
+import json
+import os
+import sys
+import time
+from typing import List, Dict, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_codec import JSON_BACKEND, get_loads, parse_catalog_page
+
+PAGE_SIZE = 30
+PAGES = 200
+ROUNDS = 5
+
+def make_page(page_number: int) -> bytes:
+    """Build a catalog search page shaped like the real catalog/v1/search/items/details response"""
+    items = []
+    for i in range(PAGE_SIZE):
+        item_id = page_number * PAGE_SIZE + i
+        items.append({
+            'id': 1000000 + item_id,
+            'itemType': 'GamePass' if i % 10 else 'Asset',
+            'assetType': None,
+            'bundleType': None,
+            'name': f'Donation Pass #{item_id}',
+            'description': 'Thank you for supporting the game! ' * 4,
+            'productId': 2000000 + item_id,
+            'genres': ['All'],
+            'itemStatus': [],
+            'itemRestrictions': [],
+            'creatorHasVerifiedBadge': False,
+            'creatorType': 'User',
+            'creatorTargetId': 123456,
+            'creatorName': 'SomeCreator',
+            'price': 5 + item_id % 500 if i % 7 else None,
+            'lowestPrice': None,
+            'priceStatus': None,
+            'unitsAvailableForConsumption': None,
+            'purchaseCount': item_id * 3,
+            'favoriteCount': item_id,
+            'offSaleDeadline': None,
+            'iconImageId': 3000000 + item_id,
+            'saleLocationType': 'NotApplicable'
+        })
+    return json.dumps({
+        'keyword': None,
+        'previousPageCursor': None,
+        'nextPageCursor': f'cursor-{page_number + 1}',
+        'data': items
+    }).encode()
+
+def parse_before(body: bytes) -> List[Dict[str, Any]]:
+    """The original path: response.json() with the stdlib decoder, then copy six fields"""
+    response = json.loads(body.decode('utf-8'))
+    gamepasses = []
+    for item in response['data']:
+        if item.get('itemType') == 'GamePass' and item.get('price'):
+            gamepass = {
+                'id': item.get('id'),
+                'name': item.get('name', 'Unknown Gamepass'),
+                'price': item.get('price'),
+                'iconImageId': item.get('iconImageId'),
+                'creatorId': item.get('creatorTargetId'),
+                'creatorName': item.get('creatorName')
+            }
+            gamepasses.append(gamepass)
+    return gamepasses
+
+def cpu_ms_per_1000_items(parse, pages: List[bytes]) -> float:
+    """Best-of-ROUNDS CPU time to parse every page, scaled to 1,000 items"""
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.process_time()
+        for body in pages:
+            parse(body)
+        best = min(best, time.process_time() - start)
+    return best * 1000 / (len(pages) * PAGE_SIZE / 1000)
+
+def main():
+    pages = [make_page(n) for n in range(PAGES)]
+    stdlib_loads = get_loads('json')
+    fast_loads = get_loads()
+    
+    results = [
+        ('before: json + dict copy', cpu_ms_per_1000_items(parse_before, pages)),
+        ('after: parse_catalog_page (json)', cpu_ms_per_1000_items(lambda body: parse_catalog_page(body, stdlib_loads), pages)),
+    ]
+    if JSON_BACKEND != 'json':
+        results.append((f'after: parse_catalog_page ({JSON_BACKEND})',
+                        cpu_ms_per_1000_items(lambda body: parse_catalog_page(body, fast_loads), pages)))
+    
+    baseline = results[0][1]
+    print(f"{PAGES} pages x {PAGE_SIZE} items, best of {ROUNDS} rounds")
+    for name, ms in results:
+        print(f"{name:<40} {ms:8.3f} ms CPU / 1,000 items  ({baseline / ms:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Event Loop Benchmark
+/getlink-shaped throughput and latency on the default asyncio loop vs uvloop
+
+Each loop runs in its own process against the same local stub Roblox server
+(benchmarks/stub_roblox.py), with the request spacing disabled so the client is the
+bottleneck. Every command resolves a fresh username and walks its catalog pages.
+
+Run from the DiscordPyBot directory:
+    python benchmarks/bench_event_loop.py
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from loop_policy import install_uvloop, loop_name, uvloop
+from rate_limiter import PriorityRateLimiter, Priority
+from roblox_api import RobloxAPI
+from stub_roblox import use_stub
+
+COMMANDS = 1000
+CONCURRENCY = 50
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+async def run_workload(base_url: str, commands: int, concurrency: int) -> dict:
+    roblox_api = RobloxAPI()
+    roblox_api.limiter = PriorityRateLimiter(min_interval=0)
+    use_stub(roblox_api, base_url)
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    
+    async def command(index: int):
+        async with semaphore:
+            started = time.perf_counter()
+            user = await roblox_api.get_user_by_username(f"benchuser{index}", priority=Priority.INTERACTIVE)
+            await roblox_api.get_user_gamepasses(user['id'], priority=Priority.INTERACTIVE)
+            latencies.append(time.perf_counter() - started)
+    
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(command(index) for index in range(commands)))
+    finally:
+        await roblox_api.close()
+    elapsed = time.perf_counter() - started
+    
+    requests = sum(lane['served'] for lane in roblox_api.limiter.stats().values())
+    return {
+        'loop': loop_name(),
+        'commands_per_s': round(commands / elapsed, 1),
+        'requests_per_s': round(requests / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 1)
+    }
+
+def worker(args):
+    if args.loop == 'uvloop' and not install_uvloop():
+        sys.exit("uvloop is not installed")
+    print(json.dumps(asyncio.run(run_workload(args.base_url, args.commands, args.concurrency))))
+
+def wait_for_server(base_url: str, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(f"{base_url}/v2/users/1/games", timeout=1).read()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--commands', type=int, default=COMMANDS)
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=5.0, help="Stub server response delay")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--loop', default='asyncio', help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        worker(args)
+        return
+    
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen([sys.executable, os.path.join(BENCH_DIR, 'stub_roblox.py'),
+                               '--port', str(args.port), '--latency-ms', str(args.latency_ms)])
+    try:
+        wait_for_server(base_url)
+        loops = ['asyncio'] + (['uvloop'] if uvloop is not None else [])
+        print(f"{args.commands} commands, {args.concurrency} concurrent, stub latency {args.latency_ms}ms")
+        if uvloop is None:
+            print("uvloop is not installed, measuring the default loop only")
+        
+        baseline = None
+        for loop in loops:
+            output = subprocess.run(
+                [sys.executable, __file__, '--worker', '--loop', loop, '--base-url', base_url,
+                 '--commands', str(args.commands), '--concurrency', str(args.concurrency)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            baseline = baseline or result['commands_per_s']
+            print(f"{result['loop']:<8} {result['commands_per_s']:8.1f} commands/s  {result['requests_per_s']:8.1f} requests/s  "
+                  f"p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms  ({result['commands_per_s'] / baseline:.2f}x)")
+    finally:
+        server.terminate()
+        server.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Gateway Memory Benchmark
+Resident memory per 1,000 guilds with the previous default intents vs the lean gateway profile
+
+No Discord connection is made: synthetic GUILD_CREATE payloads (and, for the default
+profile, the MESSAGE_CREATE traffic its message intents subscribe to) are fed straight
+into discord.py's connection state, each profile in its own process.
+
+Run from the DiscordPyBot directory:
+    python benchmarks/bench_gateway_memory.py
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import discord
+from discord.ext import commands
+
+from gateway import lean_client_options
+
+GUILDS = 5000
+CHANNELS_PER_GUILD = 25
+ROLES_PER_GUILD = 15
+EMOJIS_PER_GUILD = 20
+STICKERS_PER_GUILD = 3
+VOICE_MEMBERS_PER_GUILD = 3
+MESSAGES_PER_GUILD = 20
+TIMESTAMP = '2024-01-01T00:00:00+00:00'
+
+def make_user(user_id: int) -> dict:
+    return {'id': str(user_id), 'username': f'user{user_id}', 'discriminator': '0', 'avatar': None,
+            'global_name': f'User {user_id}'}
+
+def make_member(user_id: int) -> dict:
+    return {'user': make_user(user_id), 'roles': [], 'joined_at': TIMESTAMP, 'deaf': False, 'mute': False, 'flags': 0}
+
+def make_guild(guild_id: int, bot_id: int) -> dict:
+    """A GUILD_CREATE payload as sent without the members and presences intents"""
+    base = guild_id * 10_000
+    voice_members = [make_member(base + 9000 + i) for i in range(VOICE_MEMBERS_PER_GUILD)]
+    return {
+        'id': str(guild_id),
+        'name': f'Guild {guild_id}',
+        'owner_id': str(base + 9000),
+        'member_count': 500,
+        'large': False,
+        'features': [],
+        'roles': [
+            {'id': str(base + i), 'name': f'role{i}', 'permissions': '0', 'position': i, 'color': 0,
+             'hoist': False, 'managed': False, 'mentionable': False}
+            for i in range(ROLES_PER_GUILD)
+        ],
+        'channels': [
+            {'id': str(base + 1000 + i), 'type': 0, 'name': f'channel-{i}', 'position': i,
+             'permission_overwrites': [], 'topic': 'Trading, prices and gamepass links'}
+            for i in range(CHANNELS_PER_GUILD)
+        ],
+        'emojis': [
+            {'id': str(base + 2000 + i), 'name': f'emoji{i}', 'roles': [], 'require_colons': True,
+             'managed': False, 'animated': False, 'available': True}
+            for i in range(EMOJIS_PER_GUILD)
+        ],
+        'stickers': [
+            {'id': str(base + 3000 + i), 'name': f'sticker{i}', 'description': '', 'tags': 'robux',
+             'type': 2, 'format_type': 1, 'available': True, 'guild_id': str(guild_id)}
+            for i in range(STICKERS_PER_GUILD)
+        ],
+        'members': [make_member(bot_id)] + voice_members,
+        'voice_states': [
+            {'user_id': member['user']['id'], 'channel_id': str(base + 1000), 'session_id': 'x',
+             'deaf': False, 'mute': False, 'self_deaf': False, 'self_mute': False, 'self_video': False,
+             'suppress': False, 'request_to_speak_timestamp': None}
+            for member in voice_members
+        ],
+        'threads': [],
+        'stage_instances': [],
+        'guild_scheduled_events': []
+    }
+
+def make_message(message_id: int, guild_id: int) -> dict:
+    base = guild_id * 10_000
+    author_id = base + 5000 + message_id % 50
+    return {
+        'id': str(guild_id * 1_000_000 + message_id),
+        'channel_id': str(base + 1000 + message_id % CHANNELS_PER_GUILD),
+        'guild_id': str(guild_id),
+        'author': make_user(author_id),
+        'member': {'roles': [], 'joined_at': TIMESTAMP, 'deaf': False, 'mute': False, 'flags': 0},
+        'content': 'anyone selling a 1000 robux gamepass? ' * 3,
+        'timestamp': TIMESTAMP,
+        'edited_timestamp': None,
+        'tts': False,
+        'mention_everyone': False,
+        'mentions': [],
+        'mention_roles': [],
+        'attachments': [],
+        'embeds': [],
+        'pinned': False,
+        'type': 0
+    }
+
+def client_options(profile: str) -> dict:
+    if profile == 'lean':
+        return lean_client_options()
+    intents = discord.Intents.default()
+    intents.message_content = True
+    return {'intents': intents}
+
+def rss_bytes() -> int:
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+async def load_guilds(profile: str, guilds: int) -> dict:
+    bot = commands.Bot(command_prefix='!', **client_options(profile))
+    await bot._async_setup_hook()  # Binds the client to this loop, as login() would
+    state = bot._connection
+    bot_id = 1
+    state.user = discord.ClientUser(state=state, data=make_user(bot_id))
+    
+    gc.collect()
+    before = rss_bytes()
+    
+    for guild_id in range(1, guilds + 1):
+        state._add_guild_from_data(make_guild(guild_id, bot_id))
+    
+    # Message intents deliver every guild message; only the default profile subscribes to them
+    if bot.intents.guild_messages:
+        for guild_id in range(1, guilds + 1):
+            for message_id in range(MESSAGES_PER_GUILD):
+                state.parse_message_create(make_message(message_id, guild_id))
+        await asyncio.sleep(0)
+    
+    gc.collect()
+    used = rss_bytes() - before
+    return {
+        'profile': profile,
+        'mb_per_1000_guilds': round(used / guilds * 1000 / 1024 / 1024, 2),
+        'members_cached': sum(len(guild.members) for guild in bot.guilds),
+        'users_cached': len(state._users),
+        'emojis_cached': len(state._emojis),
+        'messages_cached': len(state._messages or ())
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--guilds', type=int, default=GUILDS)
+    parser.add_argument('--profile', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.profile:
+        print(json.dumps(asyncio.run(load_guilds(args.profile, args.guilds))))
+        return
+    
+    print(f"{args.guilds} synthetic guilds, {CHANNELS_PER_GUILD} channels, {ROLES_PER_GUILD} roles, "
+          f"{EMOJIS_PER_GUILD} emojis, {MESSAGES_PER_GUILD} messages each")
+    results = []
+    for profile in ('default', 'lean'):
+        output = subprocess.run([sys.executable, __file__, '--profile', profile, '--guilds', str(args.guilds)],
+                                check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    
+    baseline = results[0]['mb_per_1000_guilds']
+    for result in results:
+        print(f"{result['profile']:<8} {result['mb_per_1000_guilds']:7.2f} MB RSS / 1,000 guilds  "
+              f"({result['mb_per_1000_guilds'] / baseline:.2f}x)  members {result['members_cached']}  "
+              f"users {result['users_cached']}  emojis {result['emojis_cached']}  messages {result['messages_cached']}")
+
+if __name__ == "__main__":
+    main()
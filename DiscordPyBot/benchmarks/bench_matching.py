@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Matching Benchmark
+Bulk nearest-price queries with find_best_price_match vs PriceMatcher
+
+For each catalog size, every target is matched once with a find_best_price_match call
+per target, then with one PriceMatcher.nearest call over all targets, vectorized with
+NumPy when it is installed and with the pure-Python fallback. PriceMatcher times
+include building it from the catalog.
+
+Run from the DiscordPyBot directory:
+    python benchmarks/bench_matching.py
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from matching import PriceMatcher, find_best_price_match, numpy
+
+CATALOG_SIZES = (100, 1000, 5000)
+TARGETS = (1, 100, 1000)
+
+def make_catalog(size: int, rng: random.Random) -> list:
+    gamepasses = [{'id': index, 'name': f'Pass {index}', 'price': rng.randint(1, 100000)} for index in range(size)]
+    gamepasses.sort(key=lambda gp: gp['price'])
+    return gamepasses
+
+def best_time(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    engines = {'python': False}
+    if numpy is not None:
+        engines = {'numpy': True, 'python': False}
+    else:
+        print("NumPy is not installed, measuring the pure-Python fallback only")
+    
+    print(f"{'catalog':>7} {'targets':>7} {'loop':>10} " + " ".join(f"{name:>18}" for name in engines))
+    for size in CATALOG_SIZES:
+        catalog = make_catalog(size, rng)
+        for count in TARGETS:
+            targets = [rng.randint(1, 100000) for _ in range(count)]
+            
+            loop = best_time(lambda: [find_best_price_match(catalog, target) for target in targets], args.repeat)
+            columns = []
+            for use_numpy in engines.values():
+                elapsed = best_time(lambda: PriceMatcher(catalog, use_numpy=use_numpy).nearest(targets), args.repeat)
+                columns.append(f"{elapsed * 1000:9.3f} ms {loop / elapsed:5.1f}x")
+            
+            print(f"{size:>7} {count:>7} {loop * 1000:7.3f} ms " + " ".join(f"{column:>18}" for column in columns))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Stub Roblox Server
+Local stand-in for the Roblox endpoints RobloxAPI uses, for benchmarks and replay tests
+
+Run from the DiscordPyBot directory:
+    python benchmarks/stub_roblox.py --port 8765 --latency-ms 20
+
+Then point a RobloxAPI at it with use_stub(roblox_api, "http://127.0.0.1:8765").
+Every username resolves to a user whose id is derived from the name; every user
+has CATALOG_SIZE gamepasses (--catalog-size) spread over catalog search pages, and
+like the real search, page sizes other than CATALOG_PAGE_SIZES are rejected.
+"""
+
+import argparse
+import asyncio
+import zlib
+
+from aiohttp import web
+
+CATALOG_SIZE = 95
+CATALOG_PAGE_SIZES = (10, 28, 30, 60, 120)
+
+def user_id_for(username: str) -> int:
+    return zlib.crc32(username.lower().encode()) % 10_000_000 + 1
+
+def make_user(username: str) -> dict:
+    return {
+        'requestedUsername': username,
+        'hasVerifiedBadge': False,
+        'id': user_id_for(username),
+        'name': username,
+        'displayName': username.title()
+    }
+
+def make_gamepass(user_id: int, index: int) -> dict:
+    return {
+        'id': user_id * 1000 + index,
+        'itemType': 'GamePass',
+        'name': f'Donation {index}',
+        'description': 'Thank you for supporting the game!',
+        'creatorType': 'User',
+        'creatorTargetId': user_id,
+        'creatorName': f'Creator{user_id}',
+        'price': 5 + index * 7,
+        'iconImageId': 3000000 + index
+    }
+
+def create_app(latency: float = 0.0, catalog_size: int = CATALOG_SIZE) -> web.Application:
+    """Build the stub application; every response is delayed by latency seconds"""
+    
+    async def delay():
+        if latency:
+            await asyncio.sleep(latency)
+    
+    async def usernames(request: web.Request) -> web.Response:
+        await delay()
+        if request.method == 'POST':
+            names = (await request.json()).get('usernames', [])
+        else:
+            names = request.query.getall('usernames', [])
+        return web.json_response({'data': [make_user(name) for name in names]})
+    
+    async def catalog_search(request: web.Request) -> web.Response:
+        await delay()
+        user_id = int(request.query['CreatorTargetId'])
+        limit = int(request.query.get('limit', 30))
+        if limit not in CATALOG_PAGE_SIZES:
+            return web.json_response({'errors': [{'code': 0, 'message': 'Invalid limit'}]}, status=400)
+        start = int(request.query.get('cursor') or 0)
+        end = min(start + limit, catalog_size)
+        return web.json_response({
+            'previousPageCursor': None,
+            'nextPageCursor': str(end) if end < catalog_size else None,
+            'data': [make_gamepass(user_id, index) for index in range(start, end)]
+        })
+    
+    async def gamepass_thumbnails(request: web.Request) -> web.Response:
+        await delay()
+        ids = [int(gamepass_id) for gamepass_id in request.query.get('gamePassIds', '').split(',') if gamepass_id]
+        return web.json_response({'data': [
+            {'targetId': gamepass_id, 'state': 'Completed', 'imageUrl': f'https://tr.rbxcdn.com/stub/{gamepass_id}/150/150/Image/Png'}
+            for gamepass_id in ids
+        ]})
+    
+    async def user_games(request: web.Request) -> web.Response:
+        await delay()
+        return web.json_response({'data': []})
+    
+    app = web.Application()
+    app.router.add_get('/v1/usernames/users', usernames)
+    app.router.add_post('/v1/usernames/users', usernames)
+    app.router.add_get('/v1/search/items/details', catalog_search)
+    app.router.add_get('/v2/users/{user_id}/games', user_games)
+    app.router.add_get('/v1/game-passes', gamepass_thumbnails)
+    return app
+
+def use_stub(roblox_api, base_url: str):
+    """Point a RobloxAPI at a running stub server"""
+    roblox_api.users_url = f"{base_url}/v1"
+    roblox_api.catalog_url = f"{base_url}/v1"
+    roblox_api.games_url = base_url
+    roblox_api.thumbnails_url = f"{base_url}/v1"
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub Roblox API server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Delay added to every response")
+    parser.add_argument('--catalog-size', type=int, default=CATALOG_SIZE, help="Gamepasses per creator")
+    args = parser.parse_args()
+    
+    web.run_app(create_app(args.latency_ms / 1000, args.catalog_size), host=args.host, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()
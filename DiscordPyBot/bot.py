@@ -9,23 +9,66 @@ from discord import app_commands
 import aiohttp
 import asyncio
 import math
+import os
+import re
 from typing import Optional, List, Dict, Any, Union
-from roblox_api import RobloxAPI
+import matching
+from roblox_api import RobloxAPI, calculate_nct_price, calculate_ct_price, format_price_explanation
+from rate_limiter import Priority
+from deadline import Deadline
+from scheduler import CommandScheduler, SchedulerBusy, Ticket
+from watch import WatchStore, WatchScheduler
+from profiler import Profiler, MAX_SESSION_SECONDS
+from loop_monitor import LoopMonitor
+from gateway import lean_client_options
+
+# /scanmany limits
+MAX_SCAN_USERNAMES = 25
+SCAN_RESULTS_PER_PAGE = 5
+SCAN_UPDATE_INTERVAL = 1.0  # Minimum seconds between progress edits
+
+# Overall time budgets, after which commands answer with what they found so far
+GETLINK_DEADLINE = 20.0
+SCANMANY_DEADLINE = 45.0
+
+# /watch limits
+MAX_WATCHES_PER_USER = 10
+
+# Discord accepts at most 25 autocomplete choices
+MAX_AUTOCOMPLETE_CHOICES = 25
+
+# /findprice limits
+FINDPRICE_DEFAULT_LIMIT = 10
+FINDPRICE_MAX_LIMIT = 25
+
+# Reloadable extensions, in load order: the Roblox client first, then the code using it
+EXTENSIONS = ('cogs.roblox', 'cogs.matching', 'cogs.getlink')
 
 class KeilScannerBot(commands.Bot):
     """Main Discord bot class for KeilScanner"""
     
     def __init__(self):
-        intents = discord.Intents.default()
-        intents.message_content = True
-        
+        # Slash commands only: no message or member events, no member cache, no chunking
         super().__init__(
             command_prefix='!',
-            intents=intents,
-            description='A Discord bot that finds Roblox gamepasses by username with tax calculations'
+            description='A Discord bot that finds Roblox gamepasses by username with tax calculations',
+            **lean_client_options()
         )
         
         self.roblox_api = RobloxAPI()
+        
+        # Fair admission control shared by the Roblox-backed commands
+        self.scheduler = CommandScheduler()
+        
+        # /watch subscriptions, polled in the background
+        self.watch_store = WatchStore(os.getenv('WATCHES_FILE', 'watches.json'))
+        self.watch_scheduler = WatchScheduler(self.roblox_api, self.watch_store, self.notify_watch)
+        
+        # On-demand profiling sessions (/profile or SIGUSR1)
+        self.profiler = Profiler(os.getenv('PROFILE_DIR', 'profiles'))
+        
+        # Event loop lag and slow-callback reporting
+        self.loop_monitor = LoopMonitor(slow_threshold=int(os.getenv('SLOW_CALLBACK_MS', '100')) / 1000)
     
     async def setup_hook(self):
         """Setup hook called when bot is starting up"""
@@ -34,12 +77,19 @@ class KeilScannerBot(commands.Bot):
         else:
             print("Setting up bot...")
         
+        for extension in EXTENSIONS:
+            await self.load_extension(extension)
+        
         # Sync slash commands
         try:
             synced = await self.tree.sync()
             print(f"Synced {len(synced)} command(s)")
         except Exception as e:
             print(f"Failed to sync commands: {e}")
+        
+        self.loop_monitor.start()
+        self.watch_scheduler.start()
+        print(f"Watching {len(self.watch_store.subscriptions)} subscription(s)")
     
     async def on_ready(self):
         """Called when bot is ready and connected to Discord"""
@@ -57,6 +107,59 @@ class KeilScannerBot(commands.Bot):
         )
         await self.change_presence(activity=activity)
     
+    async def notify_watch(self, subscription: Dict[str, Any], gamepass: Dict[str, Any]):
+        """Tell a /watch subscriber that a matching gamepass appeared"""
+        content = (
+            f"<@{subscription['user_id']}> 🔔 **{subscription['creator_name']}** now has a gamepass at "
+            f"**{gamepass['price']} Robux** ({subscription['tax_option'].upper()} {subscription['price']} Robux)\n"
+            f"https://www.roblox.com/game-pass/{gamepass['id']}"
+        )
+        
+        channel = self.get_channel(subscription['channel_id']) if subscription.get('channel_id') else None
+        if channel is not None:
+            await channel.send(content, allowed_mentions=discord.AllowedMentions(users=True))
+            return
+        
+        user = await self.fetch_user(subscription['user_id'])
+        await user.send(content)
+    
+    def collect_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Gather runtime metrics from the bot's components, grouped by section"""
+        metrics = {
+            'scheduler': self.scheduler.stats(),
+            'watch': self.watch_scheduler.stats(),
+            'event_loop': self.loop_monitor.stats()
+        }
+        
+        # Gateway heartbeat round trip, next to the loop lag that can inflate it
+        latency_ms = self.latency * 1000
+        metrics['event_loop']['heartbeat_latency_ms'] = round(latency_ms, 1) if math.isfinite(latency_ms) else '-'
+        
+        for lane, lane_stats in self.roblox_api.limiter.stats().items():
+            metrics[f'limiter.{lane}'] = lane_stats
+        
+        metrics['hedging'] = dict(self.roblox_api.hedger.stats)
+        metrics['conditional'] = dict(self.roblox_api.conditional_stats)
+        metrics['catalog_refresh'] = dict(self.roblox_api.refresh_stats)
+        metrics['catalog_pagination'] = dict(self.roblox_api.pagination_stats)
+        metrics['price_index'] = self.roblox_api.price_index.stats()
+        
+        cache_stats = self.roblox_api.cache_manager.stats()
+        metrics['cache'] = {
+            'total_bytes': cache_stats['total_bytes'],
+            'max_bytes': cache_stats['max_bytes']
+        }
+        for name, stats in cache_stats['caches'].items():
+            metrics[f'cache.{name}'] = stats
+        
+        if self.roblox_api.shared_cache:
+            metrics['cache.shared'] = self.roblox_api.shared_cache.stats()
+        
+        if self.roblox_api.recorder:
+            metrics['recording'] = self.roblox_api.recorder.stats()
+        
+        return metrics
+    
     async def on_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
         """Handle slash command errors"""
         print(f"Slash command error: {error}")
@@ -79,9 +182,170 @@ class KeilScannerBot(commands.Bot):
                     ephemeral=True
                 )
 
-# Slash command for getting gamepass links
+async def schedule_command(interaction: discord.Interaction, cost: float = 1.0) -> Optional[Ticket]:
+    """
+    Defer the interaction and wait for the command's turn in the bot's scheduler
+    
+    Args:
+        interaction: The slash command interaction
+        cost: Relative cost of the command for fair queuing
+    
+    Returns:
+        A running Ticket that must be released when the command finishes,
+        or None if the command was shed (the user has already been told)
+    """
+    scheduler = getattr(interaction.client, 'scheduler')
+    
+    try:
+        ticket = scheduler.submit(interaction.guild_id, interaction.user.id, cost)
+    except SchedulerBusy as e:
+        await interaction.response.send_message(f"🚦 {e}. Please try again in a minute.", ephemeral=True)
+        return None
+    
+    async def report_position(position: int):
+        await interaction.edit_original_response(content=f"⏳ Queued, position {position}")
+    
+    # Until the caller has the ticket, a failure here (such as an expired interaction) must give the slot back
+    try:
+        # Defer the response as this might take some time
+        await interaction.response.defer()
+        
+        if ticket.running:
+            return ticket
+        
+        try:
+            await ticket.wait(on_position=report_position)
+        except SchedulerBusy as e:
+            await interaction.edit_original_response(content=f"🚦 {e}. Please try again in a minute.")
+            return None
+        
+        await interaction.edit_original_response(content="🔍 Searching...")
+    except BaseException:
+        ticket.release()
+        raise
+    
+    return ticket
+
+async def username_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+    """Suggest previously resolved usernames, answered from memory so it never misses Discord's deadline"""
+    suggestions = interaction.client.roblox_api.username_index.suggest(current, MAX_AUTOCOMPLETE_CHOICES)
+    return [app_commands.Choice(name=name, value=name) for name in suggestions]
+
+class ScanResultsView(discord.ui.View):
+    """Paginated view of /scanmany results that fills in as creators finish loading"""
+    
+    def __init__(self, usernames: List[str], tax_explanation: str, owner_id: int):
+        super().__init__(timeout=600)
+        self.usernames = usernames
+        self.tax_explanation = tax_explanation
+        self.owner_id = owner_id
+        self.page = 0
+        # Lowercased username -> result line, filled in as each creator completes
+        self.results: Dict[str, str] = {}
+        self._update_buttons()
+    
+    @property
+    def page_count(self) -> int:
+        return max(1, math.ceil(len(self.usernames) / SCAN_RESULTS_PER_PAGE))
+    
+    @property
+    def finished(self) -> bool:
+        return len(self.results) >= len(self.usernames)
+    
+    def set_result(self, username: str, line: str):
+        """Record the result line for a username"""
+        self.results[username.lower()] = line
+    
+    def build_embed(self) -> discord.Embed:
+        """Build the embed for the current page"""
+        done = len(self.results)
+        total = len(self.usernames)
+        
+        embed = discord.Embed(
+            title="🔎 Bulk Scan Results" if self.finished else "🔎 Bulk Scan In Progress",
+            description=f"{self.tax_explanation}\n**Progress:** {done}/{total} creators scanned",
+            color=discord.Color.green() if self.finished else discord.Color.blurple()
+        )
+        
+        start = self.page * SCAN_RESULTS_PER_PAGE
+        for username in self.usernames[start:start + SCAN_RESULTS_PER_PAGE]:
+            embed.add_field(
+                name=username,
+                value=self.results.get(username.lower(), "⏳ Loading..."),
+                inline=False
+            )
+        
+        embed.set_footer(text=f"keilscanner • Page {self.page + 1}/{self.page_count}")
+        return embed
+    
+    def _update_buttons(self):
+        self.previous_page.disabled = self.page <= 0
+        self.next_page.disabled = self.page >= self.page_count - 1
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.owner_id:
+            await interaction.response.send_message("❌ Only the person who ran this scan can change pages.", ephemeral=True)
+            return False
+        return True
+    
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = max(0, self.page - 1)
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+    
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = min(self.page_count - 1, self.page + 1)
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+def parse_usernames(raw: str) -> List[str]:
+    """
+    Split a comma or whitespace separated list of usernames, dropping duplicates
+    
+    Args:
+        raw: Raw username list as typed by the user
+    
+    Returns:
+        Usernames in their original order
+    """
+    usernames = []
+    seen = set()
+    
+    for name in re.split(r"[\s,]+", raw):
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            usernames.append(name)
+    
+    return usernames
+
+async def scan_creator(roblox_api: RobloxAPI, username: str, user_data: Dict[str, Any], target_price: int,
+                       deadline: Optional[Deadline] = None) -> str:
+    """
+    Fetch one creator's catalog and describe the best matching gamepass
+    
+    Returns:
+        Result line for the /scanmany embed
+    """
+    gamepasses = await roblox_api.get_user_gamepasses(user_data['id'], priority=Priority.INTERACTIVE, deadline=deadline)
+    partial = " ⚠️ partial" if deadline and deadline.expired else ""
+    
+    if not gamepasses:
+        return "⏱️ Timed out" if partial else "❌ No gamepasses available"
+    
+    best_match = matching.find_best_price_match(gamepasses, target_price)
+    if not best_match:
+        return f"❌ No matching gamepass ({len(gamepasses)} checked){partial}"
+    
+    gamepass = best_match['gamepass']
+    return (
+        f"✅ [{gamepass['name']}](https://www.roblox.com/game-pass/{gamepass['id']}) • "
+        f"**{gamepass['price']} Robux** (±{best_match['price_diff']}){partial}"
+    )
+
 @app_commands.describe(
-    username="Roblox username to search for gamepasses",
+    usernames="Roblox usernames separated by commas or spaces",
     price="Target price in Robux",
     tax_option="Tax calculation method"
 )
@@ -89,29 +353,28 @@ class KeilScannerBot(commands.Bot):
     app_commands.Choice(name="CT (Covered Tax)", value="ct"),
     app_commands.Choice(name="NCT (Not Covered Tax)", value="nct")
 ])
-async def getlink(interaction: discord.Interaction, username: str, price: int, tax_option: Optional[app_commands.Choice[str]] = None):
-    """Find a Roblox gamepass by username and price with tax calculations"""
+async def scanmany(interaction: discord.Interaction, usernames: str, price: int, tax_option: Optional[app_commands.Choice[str]] = None):
+    """Find matching gamepasses for many Roblox creators at once"""
     
-    print(f"Command received: /getlink {username} {price} {tax_option}")
+    print(f"Command received: /scanmany {usernames} {price} {tax_option}")
     
-    # Defer the response as this might take some time
-    await interaction.response.defer()
+    # A bulk scan costs as much as one /getlink per creator; oversized pastes are rejected
+    # below, so they are charged no more than the largest scan that could run
+    cost = min(max(1, len(parse_usernames(usernames))), MAX_SCAN_USERNAMES)
+    ticket = await schedule_command(interaction, cost=cost)
+    if ticket is None:
+        return
     
+    tasks = []
     try:
-        # Validate inputs
-        if not username.strip():
-            await interaction.followup.send("❌ Please provide a valid username.", ephemeral=True)
+        names = parse_usernames(usernames)
+        if not names:
+            await interaction.followup.send("❌ Please provide at least one username.", ephemeral=True)
             return
         
-        # Default to NCT if no tax option provided
-        if tax_option is None:
-            tax_value = "nct"
-        else:
-            tax_value = tax_option.value.lower()
-        
-        if tax_value not in ['ct', 'nct']:
+        if len(names) > MAX_SCAN_USERNAMES:
             await interaction.followup.send(
-                "❌ Invalid tax option. Please choose CT or NCT.",
+                f"❌ You can scan at most {MAX_SCAN_USERNAMES} usernames at once.",
                 ephemeral=True
             )
             return
@@ -120,179 +383,373 @@ async def getlink(interaction: discord.Interaction, username: str, price: int, t
             await interaction.followup.send("❌ Price must be a positive number.", ephemeral=True)
             return
         
-        # Calculate target price based on tax option
+        tax_value = "nct" if tax_option is None else tax_option.value.lower()
         if tax_value == 'nct':
-            # Not covered tax: calculate actual gamepass price (minus 30% Roblox tax)
-            target_price = math.floor(price * 0.7)
-            tax_explanation = f"NCT: {price} Robux → searching for ~{target_price} Robux gamepass (70% after tax)"
+            target_price = calculate_nct_price(price)
         else:
-            # Covered tax: search for exact price
-            target_price = price
-            tax_explanation = f"CT: searching for exactly {price} Robux gamepass"
+            target_price = calculate_ct_price(price)
+        tax_explanation = format_price_explanation(tax_value, price, target_price)
         
-        # Get bot instance to access RobloxAPI
         bot = interaction.client
         if not hasattr(bot, 'roblox_api'):
             await interaction.followup.send("❌ Bot configuration error. Please try again later.", ephemeral=True)
             return
         
         roblox_api = getattr(bot, 'roblox_api')
+        deadline = Deadline(SCANMANY_DEADLINE)
         
-        # Search for user and gamepasses
-        user_data = await roblox_api.get_user_by_username(username)
-        if not user_data:
-            embed = discord.Embed(
-                title="❌ User Not Found",
-                description=f"Could not find Roblox user: **{username}**\n\nPlease check the spelling and try again.",
-                color=discord.Color.red()
-            )
-            await interaction.followup.send(embed=embed)
-            return
+        # Resolve every username in one batched users call
+        users = await roblox_api.get_users_by_usernames(names, priority=Priority.INTERACTIVE, deadline=deadline)
         
-        user_id = user_data['id']
-        display_name = user_data.get('displayName', username)
+        view = ScanResultsView(names, tax_explanation, interaction.user.id)
+        for name in names:
+            if name.lower() not in users:
+                view.set_result(name, "⏱️ Timed out" if deadline.partial else "❌ User not found")
         
-        # Get user's gamepasses
-        gamepasses = await roblox_api.get_user_gamepasses(user_id)
-        if not gamepasses:
-            embed = discord.Embed(
-                title="❌ No Gamepasses Found",
-                description=f"User **{display_name}** (@{username}) has no gamepasses available.",
-                color=discord.Color.red()
-            )
-            await interaction.followup.send(embed=embed)
-            return
+        message = await interaction.followup.send(embed=view.build_embed(), view=view, wait=True)
         
-        # Find the best matching gamepass
-        best_match = find_best_price_match(gamepasses, target_price)
+        # Fetch catalogs concurrently; every request still goes through the shared rate limiter
+        async def run_scan(name: str) -> tuple:
+            try:
+                return name, await scan_creator(roblox_api, name, users[name.lower()], target_price, deadline)
+            except Exception as e:
+                print(f"Error scanning {name}: {e}")
+                return name, "❌ Error while scanning"
         
-        if not best_match:
-            embed = discord.Embed(
-                title="❌ No Matching Gamepass",
-                description=f"Could not find a suitable gamepass for **{display_name}** (@{username})\n\n"
-                          f"**Calculation:** {tax_explanation}\n"
-                          f"**Available gamepasses:** {len(gamepasses)} found",
-                color=discord.Color.red()
-            )
-            
-            # Show some available gamepasses for reference
-            if gamepasses:
-                gamepass_list = []
-                for gp in gamepasses[:5]:  # Show first 5
-                    gamepass_list.append(f"• {gp['name']}: {gp['price']} Robux")
-                
-                if len(gamepasses) > 5:
-                    gamepass_list.append(f"• ... and {len(gamepasses) - 5} more")
-                
-                embed.add_field(
-                    name="Available Gamepasses",
-                    value="\n".join(gamepass_list),
-                    inline=False
-                )
+        tasks.extend(asyncio.create_task(run_scan(name)) for name in names if name.lower() in users)
+        loop = asyncio.get_running_loop()
+        last_update = loop.time()
+        
+        for next_done in asyncio.as_completed(tasks):
+            name, line = await next_done
+            view.set_result(name, line)
             
-            await interaction.followup.send(embed=embed)
-            return
+            # Show partial results while slower creators are still loading
+            if not view.finished and loop.time() - last_update >= SCAN_UPDATE_INTERVAL:
+                await message.edit(embed=view.build_embed(), view=view)
+                last_update = loop.time()
         
-        # Create success embed
-        gamepass = best_match['gamepass']
-        price_diff = abs(gamepass['price'] - target_price)
-        accuracy = max(0, 100 - (price_diff / target_price * 100))
+        await message.edit(embed=view.build_embed(), view=view)
         
+    except Exception as e:
+        print(f"Error in scanmany command: {e}")
         embed = discord.Embed(
-            title="✅ Gamepass Found",
-            description=f"Found matching gamepass for **{display_name}** (@{username})",
-            color=discord.Color.green()
+            title="❌ Error",
+            description="An unexpected error occurred while processing your request. Please try again later.",
+            color=discord.Color.red()
         )
-        
-        # Add gamepass details
-        embed.add_field(
-            name="🎮 Gamepass",
-            value=f"**{gamepass['name']}**\n[View Gamepass](https://www.roblox.com/game-pass/{gamepass['id']})",
-            inline=True
+        try:
+            await interaction.followup.send(embed=embed)
+        except:
+            await interaction.edit_original_response(embed=embed)
+    finally:
+        # Scans still running after an error must not keep using the limiter once the slot is given back
+        for task in tasks:
+            task.cancel()
+        ticket.release()
+
+@app_commands.describe(
+    username="Roblox username of the seller to watch",
+    price="Price in Robux you want to pay",
+    tax_option="Tax calculation method"
+)
+@app_commands.choices(tax_option=[
+    app_commands.Choice(name="CT (Covered Tax)", value="ct"),
+    app_commands.Choice(name="NCT (Not Covered Tax)", value="nct")
+])
+@app_commands.autocomplete(username=username_autocomplete)
+async def watch(interaction: discord.Interaction, username: str, price: int, tax_option: Optional[app_commands.Choice[str]] = None):
+    """Get notified when a seller creates a gamepass at your price"""
+    
+    print(f"Command received: /watch {username} {price} {tax_option}")
+    
+    bot = interaction.client
+    if price <= 0:
+        await interaction.response.send_message("❌ Price must be a positive number.", ephemeral=True)
+        return
+    
+    if len(bot.watch_store.for_user(interaction.user.id)) >= MAX_WATCHES_PER_USER:
+        await interaction.response.send_message(
+            f"❌ You already have {MAX_WATCHES_PER_USER} watches. Remove one with /unwatch first.",
+            ephemeral=True
         )
+        return
+    
+    ticket = await schedule_command(interaction)
+    if ticket is None:
+        return
+    
+    try:
+        tax_value = "nct" if tax_option is None else tax_option.value.lower()
+        target_price = calculate_nct_price(price) if tax_value == 'nct' else calculate_ct_price(price)
         
-        embed.add_field(
-            name="💰 Price",
-            value=f"**{gamepass['price']} Robux**\n{tax_explanation}",
-            inline=True
-        )
+        roblox_api = bot.roblox_api
+        deadline = Deadline(GETLINK_DEADLINE)
         
-        embed.add_field(
-            name="🎯 Match Accuracy",
-            value=f"**{accuracy:.1f}%**\n(±{price_diff} Robux)",
-            inline=True
-        )
+        user_data = await roblox_api.get_user_by_username(username, priority=Priority.INTERACTIVE, deadline=deadline)
+        if not user_data:
+            await interaction.followup.send(f"❌ Could not find Roblox user: **{username}**", ephemeral=True)
+            return
         
-        # Add thumbnail if available
-        if gamepass.get('iconImageId'):
-            embed.set_thumbnail(url=f"https://www.roblox.com/asset-thumbnail/image?assetId={gamepass['iconImageId']}&width=150&height=150&format=png")
+        gamepasses = await roblox_api.get_user_gamepasses(user_data['id'], priority=Priority.INTERACTIVE, deadline=deadline)
+        existing = [gp for gp in gamepasses if gp['price'] == target_price]
+        if existing:
+            await interaction.followup.send(
+                f"✅ **{user_data['name']}** already has a gamepass at **{target_price} Robux**:\n"
+                f"https://www.roblox.com/game-pass/{existing[0]['id']}"
+            )
+            return
         
-        # Add footer
-        embed.set_footer(text=f"keilscanner • Found from {len(gamepasses)} available gamepasses")
+        subscription = bot.watch_store.add(
+            user_id=interaction.user.id,
+            channel_id=interaction.channel_id,
+            creator_id=user_data['id'],
+            creator_name=user_data['name'],
+            price=price,
+            tax_option=tax_value,
+            target_price=target_price
+        )
         
-        await interaction.followup.send(embed=embed)
+        await interaction.followup.send(
+            f"👀 Watching **{user_data['name']}** for a **{target_price} Robux** gamepass "
+            f"({format_price_explanation(tax_value, price, target_price)}).\n"
+            f"You'll be pinged here when it appears. Watch ID: `{subscription['id']}`"
+        )
         
     except Exception as e:
-        print(f"Error in getlink command: {e}")
+        print(f"Error in watch command: {e}")
+        await interaction.followup.send("❌ An unexpected error occurred while setting up the watch.", ephemeral=True)
+    finally:
+        ticket.release()
+
+@app_commands.describe(watch_id="ID of the watch to remove (see /watches)")
+async def unwatch(interaction: discord.Interaction, watch_id: int):
+    """Stop a gamepass watch"""
+    store = interaction.client.watch_store
+    subscription = store.subscriptions.get(watch_id)
+    
+    if subscription is None or subscription['user_id'] != interaction.user.id:
+        await interaction.response.send_message(f"❌ You have no watch with ID `{watch_id}`.", ephemeral=True)
+        return
+    
+    store.remove(watch_id)
+    await interaction.response.send_message(
+        f"🗑️ Stopped watching **{subscription['creator_name']}** for {subscription['target_price']} Robux.",
+        ephemeral=True
+    )
+
+async def watches(interaction: discord.Interaction):
+    """List your gamepass watches"""
+    subscriptions = interaction.client.watch_store.for_user(interaction.user.id)
+    
+    if not subscriptions:
+        await interaction.response.send_message("You have no active watches. Create one with /watch.", ephemeral=True)
+        return
+    
+    lines = [
+        f"`{sub['id']}` • **{sub['creator_name']}** at {sub['target_price']} Robux ({sub['tax_option'].upper()} {sub['price']})"
+        for sub in subscriptions
+    ]
+    await interaction.response.send_message("👀 **Your watches**\n" + "\n".join(lines), ephemeral=True)
+
+@app_commands.describe(
+    min_price="Lowest gamepass price in Robux (or the exact price if max_price is left out)",
+    max_price="Highest gamepass price in Robux",
+    limit=f"Maximum number of results (1-{FINDPRICE_MAX_LIMIT})"
+)
+async def findprice(interaction: discord.Interaction, min_price: int, max_price: Optional[int] = None,
+                    limit: Optional[int] = None):
+    """Find gamepasses at a price across every creator the bot has scanned"""
+    
+    print(f"Command received: /findprice {min_price} {max_price} {limit}")
+    
+    if max_price is None:
+        max_price = min_price
+    
+    if min_price <= 0 or max_price < min_price:
+        await interaction.response.send_message("❌ Please provide a valid price or price range.", ephemeral=True)
+        return
+    
+    limit = max(1, min(limit or FINDPRICE_DEFAULT_LIMIT, FINDPRICE_MAX_LIMIT))
+    
+    # Answered from the in-memory index only, no Roblox requests
+    price_index = interaction.client.roblox_api.price_index
+    results = price_index.query(min_price, max_price, limit)
+    total = price_index.count(min_price, max_price)
+    price_label = f"{min_price} Robux" if min_price == max_price else f"{min_price}-{max_price} Robux"
+    
+    if not results:
         embed = discord.Embed(
-            title="❌ Error",
-            description="An unexpected error occurred while processing your request. Please try again later.",
+            title="❌ No Gamepasses Found",
+            description=f"No scanned creator has a gamepass at **{price_label}** yet.\n\n"
+                        f"Creators are added to the index as they are looked up with /getlink and /scanmany.",
             color=discord.Color.red()
         )
-        try:
-            await interaction.followup.send(embed=embed)
-        except:
-            # If followup fails, try editing the original response
-            await interaction.edit_original_response(embed=embed)
+        await interaction.response.send_message(embed=embed)
+        return
+    
+    lines = [
+        f"• [{gp['name']}](https://www.roblox.com/game-pass/{gp['id']}) • **{gp['price']} Robux**"
+        f"{' by ' + gp['creatorName'] if gp.get('creatorName') else ''}"
+        for gp in results
+    ]
+    
+    embed = discord.Embed(
+        title=f"💰 Gamepasses at {price_label}",
+        description="\n".join(lines),
+        color=discord.Color.green()
+    )
+    embed.set_footer(text=f"keilscanner • Showing {len(results)} of {total} indexed matches")
+    
+    await interaction.response.send_message(embed=embed)
 
-def find_best_price_match(gamepasses: List[Dict[str, Any]], target_price: int) -> Optional[Dict[str, Any]]:
-    """
-    Find the gamepass with the closest price to the target price
+async def stats(interaction: discord.Interaction):
+    """Show runtime metrics (bot owner only)"""
+    bot = interaction.client
+    if not await bot.is_owner(interaction.user):
+        await interaction.response.send_message("❌ This command is only available to the bot owner.", ephemeral=True)
+        return
     
-    Args:
-        gamepasses: List of gamepass dictionaries
-        target_price: Target price to match
+    embed = discord.Embed(title="📊 keilscanner Metrics", color=discord.Color.blurple())
+    for section, values in bot.collect_metrics().items():
+        lines = [f"{key}: **{value}**" for key, value in values.items()]
+        embed.add_field(name=section, value="\n".join(lines) or "-", inline=True)
     
-    Returns:
-        Dictionary with 'gamepass' and 'accuracy' keys, or None if no suitable match
-    """
-    if not gamepasses:
-        return None
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+@app_commands.describe(seconds=f"How long to profile (1-{MAX_SESSION_SECONDS} seconds)")
+async def profile(interaction: discord.Interaction, seconds: int = 30):
+    """Profile the bot for a while and report the hottest code (bot owner only)"""
+    bot = interaction.client
+    if not await bot.is_owner(interaction.user):
+        await interaction.response.send_message("❌ This command is only available to the bot owner.", ephemeral=True)
+        return
     
-    best_match = None
-    best_diff = float('inf')
+    seconds = max(1, min(seconds, MAX_SESSION_SECONDS))
+    if not bot.profiler.start(seconds, asyncio.get_running_loop()):
+        await interaction.response.send_message("❌ A profiling session is already running.", ephemeral=True)
+        return
     
-    for gamepass in gamepasses:
-        if not gamepass.get('price') or gamepass['price'] <= 0:
-            continue
-            
-        price_diff = abs(gamepass['price'] - target_price)
-        
-        # Prefer exact matches, then closer prices
-        if price_diff < best_diff:
-            best_diff = price_diff
-            best_match = {
-                'gamepass': gamepass,
-                'price_diff': price_diff
-            }
+    await interaction.response.send_message(f"🔬 Profiling for {seconds} seconds...", ephemeral=True)
+    await asyncio.sleep(seconds)
+    report = bot.profiler.stop() or bot.profiler.last_report
+    
+    embed = discord.Embed(
+        title="🔬 Profile Complete",
+        description=f"{report['duration_s']}s, {report['samples']} wall-clock samples\n"
+                    f"Files: `{report['pstats']}`, `{report['collapsed']}`, `{report['timings_file']}`",
+        color=discord.Color.blurple()
+    )
+    embed.add_field(name="Top CPU (own time)", value="\n".join(report['top_cpu']) or "-", inline=False)
+    
+    timing_lines = [
+        f"{name}: {t['count']}× p50 **{t['p50_ms']}ms** p95 **{t['p95_ms']}ms**"
+        for name, t in sorted(report['timings'].items())
+    ]
+    embed.add_field(name="Command phases", value="\n".join(timing_lines) or "No commands ran", inline=False)
+    
+    await interaction.followup.send(embed=embed, ephemeral=True)
+
+@app_commands.describe(sync="Also re-sync slash commands with Discord (needed after changing command options)")
+async def reload(interaction: discord.Interaction, sync: bool = False):
+    """Hot-reload the /getlink, matching and Roblox client code (bot owner only)"""
+    bot = interaction.client
+    if not await bot.is_owner(interaction.user):
+        await interaction.response.send_message("❌ This command is only available to the bot owner.", ephemeral=True)
+        return
+    
+    await interaction.response.defer(ephemeral=True)
+    
+    # Each reload is atomic: a failing extension keeps running its previous code
+    reloaded = []
+    for extension in EXTENSIONS:
+        try:
+            await bot.reload_extension(extension)
+        except commands.ExtensionError as e:
+            print(f"Failed to reload {extension}: {e}")
+            await interaction.followup.send(
+                f"❌ Reloading `{extension}` failed: {e.__cause__ or e}\n"
+                f"Reloaded before the failure: {', '.join(reloaded) or 'nothing'}",
+                ephemeral=True
+            )
+            return
+        reloaded.append(extension)
     
-    # Return the best match if it's reasonably close (within 50% of target price)
-    if best_match and best_diff <= (target_price * 0.5):
-        return best_match
+    if sync:
+        await bot.tree.sync()
     
-    return None
+    await interaction.followup.send(
+        f"🔁 Reloaded {', '.join(reloaded)}; caches, connections and queues were kept.",
+        ephemeral=True
+    )
 
 # Create bot instance and add the slash command
 def create_bot():
     """Create and configure the bot instance"""
     bot = KeilScannerBot()
     
-    # Add the slash command to the bot
+    # /getlink is added by the cogs.getlink extension in setup_hook
+    bot.tree.add_command(
+        app_commands.Command(
+            name="scanmany",
+            description="Find matching gamepasses for many Roblox creators at once",
+            callback=scanmany
+        )
+    )
+    
+    bot.tree.add_command(
+        app_commands.Command(
+            name="watch",
+            description="Get notified when a seller creates a gamepass at your price",
+            callback=watch
+        )
+    )
+    
+    bot.tree.add_command(
+        app_commands.Command(
+            name="unwatch",
+            description="Stop a gamepass watch",
+            callback=unwatch
+        )
+    )
+    
+    bot.tree.add_command(
+        app_commands.Command(
+            name="watches",
+            description="List your gamepass watches",
+            callback=watches
+        )
+    )
+    
+    bot.tree.add_command(
+        app_commands.Command(
+            name="findprice",
+            description="Find gamepasses at a price across every creator the bot has scanned",
+            callback=findprice
+        )
+    )
+    
+    bot.tree.add_command(
+        app_commands.Command(
+            name="stats",
+            description="Show runtime metrics (bot owner only)",
+            callback=stats
+        )
+    )
+    
+    bot.tree.add_command(
+        app_commands.Command(
+            name="profile",
+            description="Profile the bot for a while and report the hottest code (bot owner only)",
+            callback=profile
+        )
+    )
+    
     bot.tree.add_command(
         app_commands.Command(
-            name="getlink",
-            description="Find a Roblox gamepass by username and price with tax calculations",
-            callback=getlink
+            name="reload",
+            description="Hot-reload the /getlink, matching and Roblox client code (bot owner only)",
+            callback=reload
         )
     )
     
@@ -0,0 +1,229 @@
+"""
+Cache Manager
+Memory-bounded TTL caches with byte accounting and global cost-aware eviction
+"""
+
+import heapq
+import itertools
+import sys
+import time
+from typing import Optional, Dict, Any, Hashable, List, Tuple
+
+# Per-entry bookkeeping overhead (entry object, dict slot, heap tuple), added to every estimate
+ENTRY_OVERHEAD = 200
+
+def estimate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """
+    Estimate the memory used by an object and everything it contains
+    
+    Args:
+        obj: Object to measure (dicts, lists, tuples, sets and scalars are walked)
+    
+    Returns:
+        Approximate size in bytes
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += estimate_size(key, _seen) + estimate_size(value, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += estimate_size(item, _seen)
+    return size
+
+class _Entry:
+    __slots__ = ('value', 'size', 'cost', 'expires_at', 'priority', 'token')
+    
+    def __init__(self, value: Any, size: int, cost: float, expires_at: float):
+        self.value = value
+        self.size = size
+        self.cost = cost
+        self.expires_at = expires_at
+        self.priority = 0.0
+        self.token = 0
+
+class ManagedCache:
+    """A named TTL cache whose memory is accounted for by a CacheManager"""
+    
+    def __init__(self, manager: 'CacheManager', name: str, ttl: float, cost: float = 1.0):
+        self.manager = manager
+        self.name = name
+        self.ttl = ttl
+        self.cost = cost  # Relative cost of refetching an entry, e.g. number of requests
+        self._entries: Dict[Hashable, _Entry] = {}
+        self.resident_bytes = 0
+        
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value, or default if it is missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        
+        self.hits += 1
+        self.manager._touch(self, key, entry)
+        return entry.value
+    
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value without counting a hit or refreshing its recency; expired entries are still returned"""
+        entry = self._entries.get(key)
+        return default if entry is None else entry.value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, cost: Optional[float] = None):
+        """
+        Store a value, evicting entries from any managed cache if the global budget is exceeded
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Seconds until the entry expires, defaults to the cache's ttl
+            cost: Refetch cost for this entry, defaults to the cache's cost
+        """
+        if key in self._entries:
+            self._remove(key)
+        
+        size = estimate_size(key) + estimate_size(value) + ENTRY_OVERHEAD
+        entry = _Entry(value, size, self.cost if cost is None else cost,
+                       time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._entries[key] = entry
+        self.resident_bytes += size
+        self.manager._added(self, key, entry)
+    
+    def invalidate(self, key: Hashable):
+        """Drop a single entry"""
+        if key in self._entries:
+            self._remove(key)
+    
+    def clear(self):
+        """Drop every entry in this cache"""
+        for key in list(self._entries):
+            self._remove(key)
+    
+    def keys(self) -> List[Hashable]:
+        return list(self._entries)
+    
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self.resident_bytes -= entry.size
+        self.manager.total_bytes -= entry.size
+    
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry.expires_at > time.monotonic()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'entries': len(self._entries),
+            'bytes': self.resident_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
+
+class CacheManager:
+    """
+    Enforces one memory budget across every ManagedCache it creates
+    
+    Eviction uses GreedyDual-Size: each entry's priority is the manager's inflation value
+    plus cost per kilobyte, refreshed on every hit. The entry with the lowest priority is
+    evicted first, so large, cheap and long-unused entries go before small or hot ones.
+    """
+    
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.caches: Dict[str, ManagedCache] = {}
+        self._heap: List[Tuple[float, int, str, Hashable]] = []
+        self._seq = itertools.count()
+        self._inflation = 0.0
+    
+    def create_cache(self, name: str, ttl: float, cost: float = 1.0) -> ManagedCache:
+        """
+        Create (or return the existing) cache with this name
+        
+        Args:
+            name: Name used in metrics
+            ttl: Default time to live in seconds
+            cost: Relative cost of refetching one entry
+        """
+        if name not in self.caches:
+            self.caches[name] = ManagedCache(self, name, ttl, cost)
+        return self.caches[name]
+    
+    def _push(self, cache: ManagedCache, key: Hashable, entry: _Entry):
+        entry.priority = self._inflation + entry.cost * 1024 / max(1, entry.size)
+        entry.token = next(self._seq)
+        heapq.heappush(self._heap, (entry.priority, entry.token, cache.name, key))
+        
+        # Stale heap items pile up on hits; rebuild once they dominate
+        if len(self._heap) > 4 * max(16, sum(len(c) for c in self.caches.values())):
+            self._rebuild_heap()
+    
+    def _rebuild_heap(self):
+        self._heap = [
+            (entry.priority, entry.token, cache.name, key)
+            for cache in self.caches.values()
+            for key, entry in cache._entries.items()
+        ]
+        heapq.heapify(self._heap)
+    
+    def _touch(self, cache: ManagedCache, key: Hashable, entry: _Entry):
+        self._push(cache, key, entry)
+    
+    def _added(self, cache: ManagedCache, key: Hashable, entry: _Entry):
+        self.total_bytes += entry.size
+        self._push(cache, key, entry)
+        self._enforce_budget()
+    
+    def _enforce_budget(self):
+        while self.total_bytes > self.max_bytes and self._heap:
+            priority, token, name, key = heapq.heappop(self._heap)
+            cache = self.caches[name]
+            entry = cache._entries.get(key)
+            if entry is None or entry.token != token:
+                continue  # Stale heap item
+            
+            self._inflation = priority
+            cache._remove(key)
+            cache.evictions += 1
+    
+    def purge_expired(self) -> int:
+        """Drop expired entries from every cache, returning how many were removed"""
+        now = time.monotonic()
+        removed = 0
+        for cache in self.caches.values():
+            for key in [key for key, entry in cache._entries.items() if entry.expires_at <= now]:
+                cache._remove(key)
+                cache.expirations += 1
+                removed += 1
+        return removed
+    
+    def stats(self) -> Dict[str, Any]:
+        """Global budget usage and per-cache resident bytes"""
+        return {
+            'total_bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'caches': {name: cache.stats() for name, cache in self.caches.items()}
+        }
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Shared Cache Daemon
+Local cache server on a Unix domain socket, shared by several bot processes
+
+Start it next to the bot processes and point them at it with SHARED_CACHE_SOCKET:
+    python cache_daemon.py --socket /tmp/keilscanner-cache.sock --max-mb 256
+
+Protocol: one JSON object per line in each direction.
+    {"op": "get", "key": k}                         -> {"ok": true, "value": v or null}
+    {"op": "mget", "keys": [k, ...]}                -> {"ok": true, "values": [v or null, ...]}
+    {"op": "set", "key": k, "value": v, "ttl": s}   -> {"ok": true}
+    {"op": "delete", "key": k}                      -> {"ok": true}
+    {"op": "stats"}                                 -> {"ok": true, "stats": {...}}
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from typing import Optional, List, Dict, Any
+
+from cache import CacheManager
+from json_codec import fast_loads
+
+# Catalog values can be large, so lines may be much longer than asyncio's 64 KiB default
+STREAM_LIMIT = 16 * 1024 * 1024
+DEFAULT_TTL = 300
+
+class CacheDaemon:
+    """Serves get/set/TTL requests from a single memory-bounded cache"""
+    
+    def __init__(self, socket_path: str, max_bytes: int = 256 * 1024 * 1024):
+        self.socket_path = socket_path
+        self.manager = CacheManager(max_bytes=max_bytes)
+        self.cache = self.manager.create_cache('shared', ttl=DEFAULT_TTL)
+        self.server: Optional[asyncio.AbstractServer] = None
+    
+    async def start(self):
+        """Start listening on the Unix socket, replacing a stale socket file"""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path,
+                                                      limit=STREAM_LIMIT)
+        print(f"Shared cache listening on {self.socket_path}")
+    
+    async def close(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+    
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply one request to the cache and build the reply"""
+        op = request.get('op')
+        
+        if op == 'get':
+            return {'ok': True, 'value': self.cache.get(request['key'])}
+        if op == 'mget':
+            return {'ok': True, 'values': [self.cache.get(key) for key in request['keys']]}
+        if op == 'set':
+            self.cache.set(request['key'], request['value'], ttl=request.get('ttl') or DEFAULT_TTL)
+            return {'ok': True}
+        if op == 'delete':
+            self.cache.invalidate(request['key'])
+            return {'ok': True}
+        if op == 'stats':
+            return {'ok': True, 'stats': self.manager.stats()}
+        
+        return {'ok': False, 'error': f"unknown op: {op}"}
+    
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                
+                try:
+                    reply = self.handle(fast_loads(line))
+                except Exception as e:
+                    reply = {'ok': False, 'error': str(e)}
+                
+                writer.write(json.dumps(reply).encode() + b'\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+class SharedCacheClient:
+    """
+    Client for CacheDaemon used by RobloxAPI as a second-level cache
+    
+    Every call fails soft: if the daemon is missing or misbehaves, the call returns a miss
+    and the client stays offline for retry_interval seconds, so the bot keeps running on
+    its in-process caches alone.
+    """
+    
+    def __init__(self, socket_path: str, timeout: float = 0.25, retry_interval: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+        self._offline_until = 0.0
+        
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+    
+    @property
+    def available(self) -> bool:
+        return asyncio.get_running_loop().time() >= self._offline_until
+    
+    async def _call(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if not self.available:
+            return None
+        
+        async with self._lock:
+            try:
+                if self._writer is None or self._writer.is_closing():
+                    self._reader, self._writer = await asyncio.wait_for(
+                        asyncio.open_unix_connection(self.socket_path, limit=STREAM_LIMIT),
+                        timeout=self.timeout
+                    )
+                
+                self._writer.write(json.dumps(request).encode() + b'\n')
+                await self._writer.drain()
+                line = await asyncio.wait_for(self._reader.readline(), timeout=self.timeout)
+                if not line:
+                    raise ConnectionError("shared cache closed the connection")
+                
+                reply = fast_loads(line)
+                return reply if reply.get('ok') else None
+            except asyncio.CancelledError:
+                # A reply may still be in flight; never let it be read as the next call's answer
+                self._disconnect()
+                raise
+            except (OSError, ConnectionError, asyncio.TimeoutError, ValueError) as e:
+                self.errors += 1
+                print(f"Shared cache unavailable, using local cache only: {e}")
+                self._disconnect()
+                self._offline_until = asyncio.get_running_loop().time() + self.retry_interval
+                return None
+    
+    def _disconnect(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+    
+    async def get(self, key: str) -> Any:
+        """Get a value, or None on a miss or if the daemon is unavailable"""
+        reply = await self._call({'op': 'get', 'key': key})
+        value = reply.get('value') if reply else None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+    
+    async def mget(self, keys: List[str]) -> List[Any]:
+        """Get several values in one round trip; misses are None"""
+        if not keys:
+            return []
+        reply = await self._call({'op': 'mget', 'keys': keys})
+        values = reply.get('values') if reply else None
+        if values is None or len(values) != len(keys):
+            values = [None] * len(keys)
+        found = sum(1 for value in values if value is not None)
+        self.hits += found
+        self.misses += len(keys) - found
+        return values
+    
+    async def set(self, key: str, value: Any, ttl: float):
+        """Store a JSON-serializable value for ttl seconds"""
+        await self._call({'op': 'set', 'key': key, 'value': value, 'ttl': ttl})
+    
+    async def delete(self, key: str):
+        await self._call({'op': 'delete', 'key': key})
+    
+    async def close(self):
+        async with self._lock:
+            self._disconnect()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'available': self.available,
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors
+        }
+
+async def serve(socket_path: str, max_bytes: int):
+    daemon = CacheDaemon(socket_path, max_bytes)
+    await daemon.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await daemon.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared cache daemon for keilscanner bot processes")
+    parser.add_argument('--socket', default=os.getenv('SHARED_CACHE_SOCKET', '/tmp/keilscanner-cache.sock'),
+                        help="Unix socket path to listen on")
+    parser.add_argument('--max-mb', type=int, default=256, help="Memory budget in megabytes")
+    args = parser.parse_args()
+    
+    try:
+        asyncio.run(serve(args.socket, args.max_mb * 1024 * 1024))
+    except KeyboardInterrupt:
+        print("\nShared cache stopped.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""
+Bot Extensions
+Reloadable parts of the bot, loaded in setup_hook and hot-reloaded with /reload
+"""
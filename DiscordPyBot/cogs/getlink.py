@@ -0,0 +1,380 @@
+"""
+GetLink Extension
+The /getlink command and its price autocomplete, loaded as a reloadable extension
+"""
+
+import math
+import time
+from contextlib import nullcontext
+from typing import Optional, List, Dict, Any, Union
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+import matching
+from bot import schedule_command, username_autocomplete, GETLINK_DEADLINE, MAX_AUTOCOMPLETE_CHOICES
+from deadline import Deadline
+from rate_limiter import Priority
+from roblox_api import RobloxAPI, calculate_nct_price, calculate_ct_price, nct_input_price
+
+# Combination mode accepts totals this far off the target when no exact combination exists
+COMBINATION_TOLERANCE = 0.02
+
+async def find_gamepass_for_price(roblox_api: RobloxAPI, username: str, target_price: int, deadline: Deadline,
+                                  combine: bool = False, profiler=None) -> Dict[str, Any]:
+    """
+    The Roblox side of /getlink: look up the user, fetch their catalog, match the price
+    and resolve the matched gamepass's icon
+    
+    The command and replay_traffic both call this, so replays issue the same requests.
+    
+    Args:
+        roblox_api: Client to use
+        username: Roblox username of the creator
+        target_price: Gamepass price to match, after the CT/NCT adjustment
+        deadline: Command budget
+        combine: Also look for combinations of gamepasses that add up to the price
+        profiler: Optional Profiler that times each phase
+    
+    Returns:
+        Dictionary with 'outcome' ('timeout', 'user_not_found', 'no_gamepasses', 'no_match',
+        'found' or 'found_combination'), 'user', 'gamepasses', 'partial' (whether the
+        catalog fetch ran out of time), 'best_match', 'combination' and 'icons'
+    """
+    span = profiler.span if profiler else (lambda name: nullcontext())
+    result = {'outcome': None, 'user': None, 'gamepasses': [], 'partial': False,
+              'best_match': None, 'combination': None, 'icons': {}}
+    
+    # Search for user and gamepasses
+    with span('getlink.user_lookup'):
+        user_data = await roblox_api.get_user_by_username(username, priority=Priority.INTERACTIVE, deadline=deadline)
+    if not user_data:
+        result['outcome'] = 'timeout' if deadline.partial else 'user_not_found'
+        return result
+    result['user'] = user_data
+    
+    # Get user's gamepasses
+    with span('getlink.gamepasses'):
+        gamepasses = await roblox_api.get_user_gamepasses(user_data['id'], priority=Priority.INTERACTIVE, deadline=deadline)
+    result['gamepasses'] = gamepasses
+    result['partial'] = deadline.partial
+    if not gamepasses:
+        result['outcome'] = 'no_gamepasses'
+        return result
+    
+    # Find the best matching gamepass
+    with span('getlink.match'):
+        best_match = matching.find_best_price_match(gamepasses, target_price)
+        combination = None
+        if combine and (not best_match or best_match['price_diff']):
+            combination = (matching.find_price_combination(gamepasses, target_price) or
+                           matching.find_price_combination(gamepasses, target_price,
+                                                           tolerance=int(target_price * COMBINATION_TOLERANCE)))
+    
+    # Several passes only win over a single one when they land closer to the target
+    if combination and len(combination['gamepasses']) > 1 and (
+            not best_match or combination['price_diff'] < best_match['price_diff']):
+        result['combination'] = combination
+        result['outcome'] = 'found_combination'
+        return result
+    
+    if not best_match:
+        result['outcome'] = 'no_match'
+        return result
+    result['best_match'] = best_match
+    result['outcome'] = 'found'
+    
+    # The icon's CDN URL (usually cached) comes from the batched thumbnails endpoint
+    with span('getlink.icons'):
+        result['icons'] = await roblox_api.get_gamepass_icons([best_match['gamepass']['id']],
+                                                              priority=Priority.INTERACTIVE, deadline=deadline)
+    
+    return result
+
+async def price_autocomplete(interaction: discord.Interaction, current: Union[int, str]) -> List[app_commands.Choice[int]]:
+    """
+    Suggest prices that match one of the chosen creator's gamepasses
+    
+    Only the creator's already indexed catalog is used, so nothing is suggested for
+    creators the bot has not scanned yet. Suggested prices are what the buyer enters,
+    so under NCT they are the prices whose 70% lands on a gamepass.
+    """
+    roblox_api = interaction.client.roblox_api
+    username = getattr(interaction.namespace, 'username', None)
+    if not username:
+        return []
+    
+    user_data = roblox_api.user_cache.peek(str(username).lower())
+    if not user_data:
+        return []
+    
+    tax_option = getattr(interaction.namespace, 'tax_option', None)
+    tax_value = str(getattr(tax_option, 'value', tax_option) or 'nct').lower()
+    typed = str(current or '').strip()
+    
+    choices = []
+    for gamepass in roblox_api.price_index.creator_gamepasses(user_data['id']):
+        if tax_value == 'ct':
+            input_price = gamepass['price']
+            target_price = calculate_ct_price(input_price)
+        else:
+            input_price = nct_input_price(gamepass['price'])
+            target_price = calculate_nct_price(input_price)
+        
+        if not str(input_price).startswith(typed):
+            continue
+        
+        name = f"{input_price} Robux ({tax_value.upper()}) → {gamepass['name']} ({target_price} Robux)"
+        choices.append(app_commands.Choice(name=name[:100], value=input_price))
+        if len(choices) >= MAX_AUTOCOMPLETE_CHOICES:
+            break
+    
+    return choices
+
+class GetLink(commands.Cog):
+    """Finds a creator's gamepass at the buyer's price"""
+    
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+    
+    @app_commands.command(name="getlink", description="Find a Roblox gamepass by username and price with tax calculations")
+    @app_commands.describe(
+        username="Roblox username to search for gamepasses",
+        price="Target price in Robux",
+        tax_option="Tax calculation method",
+        combine="Cover the price with up to 3 gamepasses when no single one matches"
+    )
+    @app_commands.choices(tax_option=[
+        app_commands.Choice(name="CT (Covered Tax)", value="ct"),
+        app_commands.Choice(name="NCT (Not Covered Tax)", value="nct")
+    ])
+    @app_commands.autocomplete(username=username_autocomplete, price=price_autocomplete)
+    async def getlink(self, interaction: discord.Interaction, username: str, price: int, tax_option: Optional[app_commands.Choice[str]] = None,
+                      combine: bool = False):
+        """Find a Roblox gamepass by username and price with tax calculations"""
+        
+        print(f"Command received: /getlink {username} {price} {tax_option}")
+        interaction.client.roblox_api.record_command('getlink', username=username, price=price,
+                                                     tax_option=tax_option.value if tax_option else None,
+                                                     combine=combine)
+        
+        profiler = interaction.client.profiler
+        started = time.perf_counter()
+        with profiler.span('getlink.queue'):
+            ticket = await schedule_command(interaction)
+        if ticket is None:
+            return
+        
+        try:
+            # Validate inputs
+            if not username.strip():
+                await interaction.followup.send("❌ Please provide a valid username.", ephemeral=True)
+                return
+            
+            # Default to NCT if no tax option provided
+            if tax_option is None:
+                tax_value = "nct"
+            else:
+                tax_value = tax_option.value.lower()
+            
+            if tax_value not in ['ct', 'nct']:
+                await interaction.followup.send(
+                    "❌ Invalid tax option. Please choose CT or NCT.",
+                    ephemeral=True
+                )
+                return
+            
+            if price <= 0:
+                await interaction.followup.send("❌ Price must be a positive number.", ephemeral=True)
+                return
+            
+            # Calculate target price based on tax option
+            if tax_value == 'nct':
+                # Not covered tax: calculate actual gamepass price (minus 30% Roblox tax)
+                target_price = math.floor(price * 0.7)
+                tax_explanation = f"NCT: {price} Robux → searching for ~{target_price} Robux gamepass (70% after tax)"
+            else:
+                # Covered tax: search for exact price
+                target_price = price
+                tax_explanation = f"CT: searching for exactly {price} Robux gamepass"
+            
+            # Get bot instance to access RobloxAPI
+            bot = interaction.client
+            if not hasattr(bot, 'roblox_api'):
+                await interaction.followup.send("❌ Bot configuration error. Please try again later.", ephemeral=True)
+                return
+            
+            roblox_api = getattr(bot, 'roblox_api')
+            deadline = Deadline(GETLINK_DEADLINE)
+            
+            result = await find_gamepass_for_price(roblox_api, username, target_price, deadline,
+                                                   combine=combine, profiler=profiler)
+            if result['outcome'] == 'timeout':
+                embed = discord.Embed(
+                    title="⏱️ Search Timed Out",
+                    description=f"Looking up **{username}** took longer than {GETLINK_DEADLINE:.0f} seconds.\n\nPlease try again in a moment.",
+                    color=discord.Color.orange()
+                )
+                await interaction.followup.send(embed=embed)
+                return
+            
+            if result['outcome'] == 'user_not_found':
+                embed = discord.Embed(
+                    title="❌ User Not Found",
+                    description=f"Could not find Roblox user: **{username}**\n\nPlease check the spelling and try again.",
+                    color=discord.Color.red()
+                )
+                await interaction.followup.send(embed=embed)
+                return
+            
+            display_name = result['user'].get('displayName', username)
+            gamepasses = result['gamepasses']
+            partial_note = f"⚠️ Partial scan: stopped after {GETLINK_DEADLINE:.0f}s, showing the best match found so far" if result['partial'] else ""
+            
+            if result['outcome'] == 'no_gamepasses':
+                embed = discord.Embed(
+                    title="❌ No Gamepasses Found",
+                    description=f"User **{display_name}** (@{username}) has no gamepasses available.",
+                    color=discord.Color.red()
+                )
+                if partial_note:
+                    embed.description = f"No gamepasses for **{display_name}** (@{username}) were found before the search timed out."
+                    embed.set_footer(text=partial_note)
+                await interaction.followup.send(embed=embed)
+                return
+            
+            combination = result['combination']
+            if result['outcome'] == 'found_combination':
+                total = combination['total']
+                price_diff = combination['price_diff']
+                accuracy = max(0, 100 - (price_diff / target_price * 100))
+                
+                embed = discord.Embed(
+                    title="✅ Gamepass Combination Found",
+                    description=f"Found {len(combination['gamepasses'])} gamepasses for **{display_name}** (@{username}) "
+                              f"that add up to the price",
+                    color=discord.Color.green()
+                )
+                
+                embed.add_field(
+                    name="🎮 Gamepasses",
+                    value="\n".join(f"• [{gp['name']}](https://www.roblox.com/game-pass/{gp['id']}): **{gp['price']} Robux**"
+                                    for gp in combination['gamepasses']),
+                    inline=False
+                )
+                
+                embed.add_field(
+                    name="💰 Total",
+                    value=f"**{total} Robux**\n{tax_explanation}",
+                    inline=True
+                )
+                
+                embed.add_field(
+                    name="🎯 Match Accuracy",
+                    value=f"**{accuracy:.1f}%**\n(±{price_diff} Robux)",
+                    inline=True
+                )
+                
+                if partial_note:
+                    embed.set_footer(text=f"{partial_note} • {len(gamepasses)} gamepasses checked")
+                else:
+                    embed.set_footer(text=f"keilscanner • Combined from {len(gamepasses)} available gamepasses")
+                
+                await interaction.followup.send(embed=embed)
+                return
+            
+            if result['outcome'] == 'no_match':
+                embed = discord.Embed(
+                    title="❌ No Matching Gamepass",
+                    description=f"Could not find a suitable gamepass for **{display_name}** (@{username})\n\n"
+                              f"**Calculation:** {tax_explanation}\n"
+                              f"**Available gamepasses:** {len(gamepasses)} found",
+                    color=discord.Color.red()
+                )
+                
+                # Show some available gamepasses for reference
+                if gamepasses:
+                    gamepass_list = []
+                    for gp in gamepasses[:5]:  # Show first 5
+                        gamepass_list.append(f"• {gp['name']}: {gp['price']} Robux")
+                    
+                    if len(gamepasses) > 5:
+                        gamepass_list.append(f"• ... and {len(gamepasses) - 5} more")
+                    
+                    embed.add_field(
+                        name="Available Gamepasses",
+                        value="\n".join(gamepass_list),
+                        inline=False
+                    )
+                
+                if partial_note:
+                    embed.set_footer(text=partial_note)
+                
+                await interaction.followup.send(embed=embed)
+                return
+            
+            # Create success embed
+            gamepass = result['best_match']['gamepass']
+            icons = result['icons']
+            
+            price_diff = abs(gamepass['price'] - target_price)
+            accuracy = max(0, 100 - (price_diff / target_price * 100))
+            
+            embed = discord.Embed(
+                title="✅ Gamepass Found",
+                description=f"Found matching gamepass for **{display_name}** (@{username})",
+                color=discord.Color.green()
+            )
+            
+            # Add gamepass details
+            embed.add_field(
+                name="🎮 Gamepass",
+                value=f"**{gamepass['name']}**\n[View Gamepass](https://www.roblox.com/game-pass/{gamepass['id']})",
+                inline=True
+            )
+            
+            embed.add_field(
+                name="💰 Price",
+                value=f"**{gamepass['price']} Robux**\n{tax_explanation}",
+                inline=True
+            )
+            
+            embed.add_field(
+                name="🎯 Match Accuracy",
+                value=f"**{accuracy:.1f}%**\n(±{price_diff} Robux)",
+                inline=True
+            )
+            
+            # Add thumbnail if available, preferring the resolved CDN image
+            if gamepass['id'] in icons:
+                embed.set_thumbnail(url=icons[gamepass['id']])
+            elif gamepass.get('iconImageId'):
+                embed.set_thumbnail(url=f"https://www.roblox.com/asset-thumbnail/image?assetId={gamepass['iconImageId']}&width=150&height=150&format=png")
+            
+            # Add footer
+            if partial_note:
+                embed.set_footer(text=f"{partial_note} • {len(gamepasses)} gamepasses checked")
+            else:
+                embed.set_footer(text=f"keilscanner • Found from {len(gamepasses)} available gamepasses")
+            
+            await interaction.followup.send(embed=embed)
+        
+        except Exception as e:
+            print(f"Error in getlink command: {e}")
+            embed = discord.Embed(
+                title="❌ Error",
+                description="An unexpected error occurred while processing your request. Please try again later.",
+                color=discord.Color.red()
+            )
+            try:
+                await interaction.followup.send(embed=embed)
+            except:
+                # If followup fails, try editing the original response
+                await interaction.edit_original_response(embed=embed)
+        finally:
+            ticket.release()
+            profiler.record('getlink.total', time.perf_counter() - started)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(GetLink(bot))
@@ -0,0 +1,14 @@
+"""
+Matching Extension
+Reloading this extension re-executes matching.py, so /getlink and /scanmany pick up
+changes to the price matching code without a restart
+"""
+
+import importlib
+
+from discord.ext import commands
+
+import matching
+
+async def setup(bot: commands.Bot):
+    importlib.reload(matching)
@@ -0,0 +1,22 @@
+"""
+Roblox Extension
+Wires the RobloxAPI client into the bot
+
+Reloading this extension re-executes roblox_api.py and rebuilds the client from the new
+code, keeping the running client's HTTP session, limiter, caches and indexes.
+"""
+
+import importlib
+
+from discord.ext import commands
+
+import roblox_api
+
+async def setup(bot: commands.Bot):
+    importlib.reload(roblox_api)
+    
+    previous = getattr(bot, 'roblox_api', None)
+    client = roblox_api.RobloxAPI.from_previous(previous) if previous else roblox_api.RobloxAPI()
+    
+    bot.roblox_api = client
+    bot.watch_scheduler.roblox_api = client
@@ -0,0 +1,62 @@
+"""
+Deadline Budgets
+Overall time budget for a command, passed down through RobloxAPI calls
+"""
+
+import asyncio
+from typing import Optional, Awaitable, TypeVar
+
+T = TypeVar('T')
+
+class Deadline:
+    """
+    Tracks how much of a command's time budget is left
+    
+    RobloxAPI methods that receive a Deadline stop paginating once it runs out and
+    cancel any request still in flight, marking the result as partial so the caller
+    can answer with what it has so far.
+    """
+    
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = asyncio.get_running_loop().time() + budget
+        self.partial = False
+    
+    def remaining(self) -> float:
+        """Seconds left in the budget, never negative"""
+        return max(0.0, self.expires_at - asyncio.get_running_loop().time())
+    
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+    
+    def check(self) -> bool:
+        """
+        Check the budget before starting more work
+        
+        Returns:
+            True if there is time left; otherwise the deadline is marked partial
+        """
+        if self.expired:
+            self.partial = True
+            return False
+        return True
+    
+    async def run(self, awaitable: Awaitable[T]) -> Optional[T]:
+        """
+        Await something within the remaining budget
+        
+        Returns:
+            The awaitable's result, or None if the budget ran out (it is cancelled
+            and the deadline is marked partial)
+        """
+        if not self.check():
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            return None
+        
+        try:
+            return await asyncio.wait_for(awaitable, timeout=self.remaining())
+        except asyncio.TimeoutError:
+            self.partial = True
+            return None
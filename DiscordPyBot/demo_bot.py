@@ -6,15 +6,14 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 
+from gateway import lean_client_options
+
 class DemoBot(commands.Bot):
     def __init__(self):
-        intents = discord.Intents.default()
-        intents.message_content = True
-        
         super().__init__(
             command_prefix='!',
-            intents=intents,
-            description='Demo bot showing improved slash command format'
+            description='Demo bot showing improved slash command format',
+            **lean_client_options()
         )
     
     async def on_ready(self):
@@ -0,0 +1,32 @@
+"""
+Gateway Profile
+Lean discord.py client options for bots that only use slash commands and context menus
+"""
+
+from typing import Dict, Any
+
+import discord
+
+# Upper bound on discord.py's message cache; interactions carry the messages they act on
+MESSAGE_CACHE_SIZE = 100
+
+def lean_intents() -> discord.Intents:
+    """
+    Only the guilds intent
+    
+    Interactions arrive regardless of intents, and the guilds intent keeps channels cached
+    for sending notifications. Message, member, presence, typing, voice and emoji events
+    are never subscribed to, so Discord does not send them and nothing caches them.
+    """
+    intents = discord.Intents.none()
+    intents.guilds = True
+    return intents
+
+def lean_client_options() -> Dict[str, Any]:
+    """Keyword arguments for discord.Client / commands.Bot that keep per-guild memory small"""
+    return {
+        'intents': lean_intents(),
+        'member_cache_flags': discord.MemberCacheFlags.none(),
+        'chunk_guilds_at_startup': False,
+        'max_messages': MESSAGE_CACHE_SIZE
+    }
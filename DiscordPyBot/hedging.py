@@ -0,0 +1,129 @@
+"""
+Hedged Requests
+Race a primary and a secondary data source, firing the secondary only when the primary is slow
+"""
+
+import asyncio
+from collections import deque
+from typing import Optional, Dict, Any, Callable, Awaitable, Deque, TypeVar
+
+T = TypeVar('T')
+
+class LatencyTracker:
+    """Rolling window of latencies for one source, used to pick the hedge delay"""
+    
+    def __init__(self, window: int = 100):
+        self.samples: Deque[float] = deque(maxlen=window)
+    
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency at the given percentile (0-100), or None without samples"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index]
+
+class Hedger:
+    """
+    Runs hedged calls and keeps per-source latency and win statistics
+    
+    The primary starts immediately. If it has not produced a valid answer after the
+    hedge delay (a fixed value or the primary's p95 latency) and the caller says there
+    is rate budget to spare, the secondary starts too. The first valid answer wins and
+    the other call is cancelled. Without budget the secondary only runs as a plain
+    fallback once the primary has failed.
+    """
+    
+    def __init__(self, default_delay: float = 1.0, percentile: float = 95):
+        self.default_delay = default_delay
+        self.percentile = percentile
+        self.latency: Dict[str, LatencyTracker] = {}
+        self.stats = {
+            'calls': 0,
+            'hedged': 0,
+            'secondary_wins': 0,
+            'fallbacks': 0,
+            'skipped_no_budget': 0
+        }
+    
+    def delay_for(self, source: str) -> float:
+        """Hedge delay for a source: its p95 latency, or the default before any samples"""
+        tracker = self.latency.get(source)
+        observed = tracker.percentile(self.percentile) if tracker else None
+        return observed if observed is not None else self.default_delay
+    
+    async def _timed(self, source: str, call: Callable[[], Awaitable[T]]) -> T:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await call()
+        self.latency.setdefault(source, LatencyTracker()).record(loop.time() - started)
+        return result
+    
+    async def run(self, source: str, primary: Callable[[], Awaitable[T]], secondary: Callable[[], Awaitable[T]],
+                  is_valid: Callable[[T], bool] = bool, delay: Optional[float] = None,
+                  has_budget: Callable[[], bool] = lambda: True) -> Optional[T]:
+        """
+        Race primary against a delayed secondary
+        
+        Args:
+            source: Name of the primary source, used for latency tracking
+            primary: Factory for the primary call
+            secondary: Factory for the secondary call
+            is_valid: Decides whether a result is a usable answer
+            delay: Seconds to wait before hedging, defaults to the primary's p95 latency
+            has_budget: Called before firing the secondary; False skips the hedge
+        
+        Returns:
+            The first valid result, or the last result seen if neither was valid
+        """
+        self.stats['calls'] += 1
+        hedge_delay = self.delay_for(source) if delay is None else delay
+        primary_task = asyncio.create_task(self._timed(source, primary))
+        tasks = {primary_task}
+        result = None
+        
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            
+            if done:
+                result = primary_task.result() if primary_task.exception() is None else None
+                if is_valid(result):
+                    return result
+                # Primary failed fast, fall back to the secondary
+                self.stats['fallbacks'] += 1
+                return await secondary()
+            
+            if not has_budget():
+                self.stats['skipped_no_budget'] += 1
+                await asyncio.wait(tasks)
+                result = primary_task.result() if primary_task.exception() is None else None
+                if is_valid(result):
+                    return result
+                self.stats['fallbacks'] += 1
+                return await secondary()
+            
+            self.stats['hedged'] += 1
+            secondary_task = asyncio.create_task(secondary())
+            tasks.add(secondary_task)
+            
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        continue
+                    result = task.result()
+                    if is_valid(result):
+                        if task is secondary_task:
+                            self.stats['secondary_wins'] += 1
+                        return result
+            
+            return result
+        finally:
+            # Cancel whichever call lost (or everything, if we were cancelled ourselves)
+            for task in tasks:
+                task.cancel()
+            if not primary_task.done():
+                primary_task.cancel()
@@ -0,0 +1,74 @@
+"""
+JSON Decoding
+Pluggable fast JSON decoder and field-selective parsing of Roblox catalog pages
+"""
+
+import json
+from typing import Optional, List, Dict, Any, Callable, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JsonLoads = Callable[[Union[bytes, str]], Any]
+
+def _stdlib_loads(data: Union[bytes, str]) -> Any:
+    return json.loads(data)
+
+if orjson is not None:
+    JSON_BACKEND = 'orjson'
+    fast_loads: JsonLoads = orjson.loads
+else:
+    JSON_BACKEND = 'json'
+    fast_loads = _stdlib_loads
+
+def get_loads(backend: Optional[str] = None) -> JsonLoads:
+    """
+    Get a JSON decoder by name
+    
+    Args:
+        backend: 'orjson', 'json', or None for the fastest one installed
+    
+    Returns:
+        Callable decoding bytes or str into Python objects
+    """
+    if backend is None:
+        return fast_loads
+    if backend == 'orjson' and orjson is not None:
+        return orjson.loads
+    if backend == 'json':
+        return _stdlib_loads
+    raise ValueError(f"JSON backend not available: {backend}")
+
+def parse_catalog_page(body: bytes, loads: JsonLoads = fast_loads) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Decode a catalog search page straight into gamepass dictionaries
+    
+    Only priced GamePass items are kept, and only the fields the bot uses are copied.
+    
+    Args:
+        body: Raw response body from catalog/v1/search/items/details
+        loads: JSON decoder to use
+    
+    Returns:
+        Tuple of (gamepasses on this page, next page cursor or None)
+    """
+    page = loads(body)
+    if not isinstance(page, dict):
+        return [], None
+    
+    gamepasses = [
+        {
+            'id': item.get('id'),
+            'name': item.get('name', 'Unknown Gamepass'),
+            'price': price,
+            'iconImageId': item.get('iconImageId'),
+            'creatorId': item.get('creatorTargetId'),
+            'creatorName': item.get('creatorName')
+        }
+        for item in page.get('data') or ()
+        if item.get('itemType') == 'GamePass' and (price := item.get('price'))
+    ]
+    
+    return gamepasses, page.get('nextPageCursor')
@@ -10,20 +10,25 @@ import aiohttp
 import asyncio
 import os
 from dotenv import load_dotenv
+from roblox_api import RobloxAPI
+from gateway import lean_client_options
+from result_index import ResultIndex
 
 load_dotenv()
 
 class KeilScannerBot(commands.Bot):
     def __init__(self):
-        intents = discord.Intents.default()
-        intents.message_content = True
-        
+        # Slash commands and context menus only, so no message content or member events
         super().__init__(
             command_prefix='!',
-            intents=intents
+            **lean_client_options()
         )
         
         self.session = None
+        self.roblox_api = RobloxAPI()
+        
+        # Posted /getlink results by message id, so scans never parse or fetch messages
+        self.result_index = ResultIndex(path=os.getenv('RESULT_INDEX_FILE'))
     
     async def setup_hook(self):
         try:
@@ -31,6 +36,19 @@ class KeilScannerBot(commands.Bot):
             print(f"Synced {len(synced)} commands")
         except Exception as e:
             print(f"Sync failed: {e}")
+        
+        if self.result_index.path:
+            self.loop.create_task(self.save_result_index_periodically())
+    
+    async def save_result_index_periodically(self, interval: float = 60.0):
+        while True:
+            await asyncio.sleep(interval)
+            if self.result_index.dirty:
+                self.result_index.save()
+    
+    async def close(self):
+        self.result_index.save()
+        await super().close()
     
     async def on_ready(self):
         print(f'{self.user} connected to Discord!')
@@ -40,23 +58,6 @@ class KeilScannerBot(commands.Bot):
         activity = discord.Activity(type=discord.ActivityType.watching, name="for /getlink commands")
         await self.change_presence(activity=activity)
     
-    async def on_message(self, message):
-        # Don't respond to own messages
-        if message.author == self.user:
-            return
-        
-        # Check if this is a reply to our bot and contains "scan"
-        if (message.reference and 
-            message.content.lower().strip() == "scan" and
-            message.reference.resolved and
-            message.reference.resolved.author == self.user):
-            
-            print(f"Scan request from {message.author.name}")
-            await self.handle_scan_request(message)
-        
-        # Process other commands
-        await self.process_commands(message)
-    
     async def get_session(self):
         if self.session is None or self.session.closed:
             self.session = aiohttp.ClientSession(
@@ -185,87 +186,54 @@ class KeilScannerBot(commands.Bot):
     
     async def check_regional_pricing(self, gamepass_id):
         """Check if a gamepass has regional pricing enabled"""
-        session = await self.get_session()
+        # Product info and catalog details are hedged against each other by RobloxAPI
+        regional_pricing = await self.roblox_api.check_regional_pricing(gamepass_id)
+        print(f"Regional pricing for gamepass {gamepass_id}: {regional_pricing}")
+        return regional_pricing
+    
+    async def handle_scan_request(self, interaction: discord.Interaction, message: discord.Message):
+        """Handle a "Scan Regional Pricing" context menu request on one of our /getlink results"""
+        if message.author.id != self.user.id:
+            await interaction.response.send_message("❌ Scan only works on keilscanner /getlink results.", ephemeral=True)
+            return
         
-        # Get gamepass details from Roblox API
-        url = f"https://apis.roblox.com/game-passes/v1/game-passes/{gamepass_id}/product-info"
+        # Results posted since the index was built are a single lookup; older ones fall back to the link
+        result = self.result_index.get(message.id)
+        if result is not None:
+            gamepass_id = result[0]
+        else:
+            gamepass_id = await self.extract_gamepass_id_from_message(message.content)
         
-        try:
-            async with session.get(url) as resp:
-                print(f"Regional pricing check status: {resp.status}")
-                if resp.status == 200:
-                    data = await resp.json()
-                    print(f"Gamepass details: {data}")
-                    
-                    # Check if regional pricing is enabled
-                    # Roblox API typically shows this in the product info
-                    regional_pricing = data.get('IsRegionalPricingEnabled', False)
-                    
-                    return regional_pricing
-                else:
-                    print(f"Failed to get gamepass details: {resp.status}")
-                    # Try alternative endpoint
-                    return await self.check_regional_pricing_alternative(gamepass_id)
-        except Exception as e:
-            print(f"Error checking regional pricing: {e}")
-            return None
-    
-    async def check_regional_pricing_alternative(self, gamepass_id):
-        """Alternative method to check regional pricing"""
-        session = await self.get_session()
+        if not gamepass_id:
+            await interaction.response.send_message("❌ Could not find gamepass ID in the original message.", ephemeral=True)
+            return
         
-        # Try the catalog API endpoint
-        url = f"https://catalog.roblox.com/v1/catalog/items/{gamepass_id}/details"
+        print(f"Checking regional pricing for gamepass ID: {gamepass_id}")
         
-        try:
-            async with session.get(url) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    
-                    # Look for regional pricing indicators
-                    price_config = data.get('priceConfiguration', {})
-                    has_regional = price_config.get('hasRegionalPricing', False)
-                    
-                    return has_regional
-        except Exception as e:
-            print(f"Alternative regional pricing check failed: {e}")
+        # Send initial response
+        await interaction.response.send_message("🔍 Checking regional pricing...")
         
-        return None
-    
-    async def handle_scan_request(self, message):
-        """Handle scan request to check regional pricing"""
         try:
-            # Get the original bot message that was replied to
-            original_message = message.reference.resolved
-            
-            # Extract gamepass ID from the original message
-            gamepass_id = await self.extract_gamepass_id_from_message(original_message.content)
-            
-            if not gamepass_id:
-                await message.reply("❌ Could not find gamepass ID in the original message.")
-                return
-            
-            print(f"Checking regional pricing for gamepass ID: {gamepass_id}")
-            
-            # Send initial response
-            scan_message = await message.reply("🔍 Checking regional pricing...")
-            
-            # Check regional pricing
             has_regional_pricing = await self.check_regional_pricing(gamepass_id)
             
             if has_regional_pricing is None:
-                await scan_message.edit(content="❌ Unable to check regional pricing status.")
+                await interaction.edit_original_response(content="❌ Unable to check regional pricing status.")
             elif has_regional_pricing:
-                await scan_message.edit(content="🌍 Regional Pricing Detected")
+                await interaction.edit_original_response(content="🌍 Regional Pricing Detected")
             else:
-                await scan_message.edit(content="Regional Pricing Not Detected")
+                await interaction.edit_original_response(content="Regional Pricing Not Detected")
                 
         except Exception as e:
             print(f"Error in scan request: {e}")
-            await message.reply("❌ Error occurred while checking regional pricing.")
+            await interaction.edit_original_response(content="❌ Error occurred while checking regional pricing.")
 
 bot = KeilScannerBot()
 
+@bot.tree.context_menu(name="Scan Regional Pricing")
+async def scan(interaction: discord.Interaction, message: discord.Message):
+    print(f"Scan request from {interaction.user.name}")
+    await bot.handle_scan_request(interaction, message)
+
 @bot.tree.command(name="getlink", description="Find Roblox gamepass by username and price")
 @app_commands.describe(
     username="Roblox username to search",
@@ -337,8 +305,13 @@ async def getlink(interaction: discord.Interaction, username: str, price: int, t
             f"You will receive: {earnings} Robux"
         )
 
-        await interaction.edit_original_response(content=response)
-        print(f"Success: Found gamepass '{best_match['name']}' (ID: {best_match['id']}) for {username}"
+        result_message = await interaction.edit_original_response(content=response)
+        bot.result_index.record(result_message.id, best_match['id'], user_id, best_match['price'])
+        print(f"Success: Found gamepass '{best_match['name']}' (ID: {best_match['id']}) for {username}")
+        
+    except Exception as e:
+        print(f"Command error: {e}")
+        await interaction.edit_original_response(content=f"❌ Error occurred: {str(e)}")
 
 if __name__ == "__main__":
     token = os.getenv('DISCORD_BOT_TOKEN')
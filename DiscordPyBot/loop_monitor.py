@@ -0,0 +1,137 @@
+"""
+Event Loop Monitor
+Measures event loop lag and captures where slow callbacks block the loop
+"""
+
+import asyncio
+import bisect
+import math
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque, Counter
+from typing import Optional, List, Dict, Any
+
+# Upper bounds of the lag histogram buckets, in milliseconds
+LAG_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)
+
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class LoopMonitor:
+    """
+    Lag probe plus slow-callback watchdog for the bot's event loop
+    
+    A probe task sleeps for interval seconds and records how late it wakes up; that
+    lateness is the time other callbacks held the loop. A watchdog thread notices when
+    the probe has not run for slow_threshold past its wake-up time and grabs the loop
+    thread's stack while it is still blocked, so each slow callback is reported with
+    where it was stuck rather than just how long it took.
+    """
+    
+    def __init__(self, interval: float = 0.25, slow_threshold: float = 0.1,
+                 window: int = 2400, max_reports: int = 20):
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self._lags: deque = deque(maxlen=window)  # Recent lags in seconds
+        self._histogram = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self.slow_callbacks: deque = deque(maxlen=max_reports)
+        self._origins: Counter = Counter()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._loop_thread = 0
+        self._due = 0.0  # time.monotonic() at which the probe should next run
+        self._pending_stack: Optional[Dict[str, Any]] = None
+        
+        # Metrics
+        self.samples = 0
+        self.slow_count = 0
+    
+    def start(self):
+        """Start the probe on the running event loop and the watchdog thread"""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop_thread = threading.get_ident()
+        self._due = time.monotonic() + self.interval
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._probe())
+        self._watchdog = threading.Thread(target=self._watch, name='loop-watchdog', daemon=True)
+        self._watchdog.start()
+    
+    def stop(self):
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+    
+    async def _probe(self):
+        while True:
+            self._due = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            self._record(max(0.0, time.monotonic() - self._due))
+    
+    def _record(self, lag: float):
+        self.samples += 1
+        self._lags.append(lag)
+        self._histogram[bisect.bisect_left(LAG_BUCKETS_MS, lag * 1000)] += 1
+        
+        if lag < self.slow_threshold:
+            self._pending_stack = None
+            return
+        
+        stack, self._pending_stack = self._pending_stack, None
+        origin = stack['origin'] if stack else 'unknown (blocked between watchdog checks)'
+        self.slow_count += 1
+        self._origins[origin] += 1
+        self.slow_callbacks.append({
+            'at': time.time(),
+            'lag_ms': round(lag * 1000, 1),
+            'origin': origin,
+            'stack': stack['frames'] if stack else []
+        })
+        print(f"Event loop blocked for {lag * 1000:.0f}ms at {origin}")
+    
+    def _watch(self):
+        while not self._stopped.wait(self.slow_threshold / 2):
+            if self._pending_stack is None and time.monotonic() - self._due > self.slow_threshold:
+                frame = sys._current_frames().get(self._loop_thread)
+                if frame is not None:
+                    self._pending_stack = format_stack(frame)
+    
+    def lag_percentile(self, pct: float) -> float:
+        """Lag percentile over the recent window, in milliseconds"""
+        if not self._lags:
+            return 0.0
+        ordered = sorted(self._lags)
+        return round(ordered[min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1)] * 1000, 1)
+    
+    def stats(self) -> Dict[str, Any]:
+        buckets = [f"≤{bound}ms" for bound in LAG_BUCKETS_MS] + [f">{LAG_BUCKETS_MS[-1]}ms"]
+        top_origin = self._origins.most_common(1)
+        return {
+            'samples': self.samples,
+            'lag_p50_ms': self.lag_percentile(50),
+            'lag_p95_ms': self.lag_percentile(95),
+            'lag_p99_ms': self.lag_percentile(99),
+            'lag_max_ms': round(max(self._lags, default=0) * 1000, 1),
+            'lag_histogram': ' '.join(f"{bucket}:{count}" for bucket, count in zip(buckets, self._histogram) if count),
+            'slow_callbacks': self.slow_count,
+            'top_slow_origin': f"{top_origin[0][0]} ({top_origin[0][1]}×)" if top_origin else '-'
+        }
+
+def format_stack(frame, limit: int = 8) -> Dict[str, Any]:
+    """
+    Summarize a blocked stack
+    
+    Returns:
+        Dictionary with the innermost frames (outermost first) and the origin: the innermost
+        frame in the bot's own code, or the innermost frame if none of the bot's code is on it
+    """
+    entries = traceback.extract_stack(frame)
+    own = [entry for entry in entries if entry.filename.startswith(_PROJECT_DIR)]
+    origin = (own or entries)[-1]
+    return {
+        'origin': f"{os.path.basename(origin.filename)}:{origin.lineno} in {origin.name}",
+        'frames': [f"{os.path.basename(entry.filename)}:{entry.lineno} in {entry.name}" for entry in entries[-limit:]]
+    }
@@ -0,0 +1,28 @@
+"""
+Event Loop Policy
+Optional uvloop event loop with a clean fallback to the default asyncio loop
+"""
+
+import asyncio
+
+try:
+    import uvloop
+except ImportError:  # Optional dependency
+    uvloop = None
+
+def install_uvloop() -> bool:
+    """
+    Make asyncio.run (and so bot.run) create uvloop event loops
+    
+    Returns:
+        True if uvloop is installed and now in use, False if the default loop is kept
+    """
+    if uvloop is None:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+def loop_name() -> str:
+    """Name of the event loop implementation asyncio will create"""
+    policy = asyncio.get_event_loop_policy()
+    return 'uvloop' if uvloop is not None and isinstance(policy, uvloop.EventLoopPolicy) else 'asyncio'
@@ -6,8 +6,10 @@ Starts the keilscanner Discord bot
 
 import asyncio
 import os
+import signal
 from dotenv import load_dotenv
 from bot import create_bot
+from loop_policy import install_uvloop
 
 def main():
     """Main entry point for the Discord bot"""
@@ -21,9 +23,45 @@ def main():
         print("Please set your Discord bot token in the .env file or environment.")
         return
     
+    # Optional uvloop event loop, must be chosen before bot.run creates the loop
+    if os.getenv('USE_UVLOOP', '').lower() in ('1', 'true', 'yes'):
+        if install_uvloop():
+            print("Using uvloop event loop")
+        else:
+            print("USE_UVLOOP is set but uvloop is not installed, using the default asyncio loop")
+    
     # Create and run the bot
     bot = create_bot()
     
+    # Optional global memory budget for the Roblox API caches
+    cache_max_mb = os.getenv('CACHE_MAX_MB')
+    if cache_max_mb:
+        bot.roblox_api.cache_manager.max_bytes = int(cache_max_mb) * 1024 * 1024
+    
+    # Optional memory budget for the price index behind /findprice and price autocomplete
+    price_index_max_mb = os.getenv('PRICE_INDEX_MAX_MB')
+    if price_index_max_mb:
+        bot.roblox_api.price_index.max_bytes = int(price_index_max_mb) * 1024 * 1024
+    
+    # Optional cache daemon shared with other bot processes (see cache_daemon.py)
+    shared_cache_socket = os.getenv('SHARED_CACHE_SOCKET')
+    if shared_cache_socket:
+        bot.roblox_api.enable_shared_cache(shared_cache_socket)
+    
+    # Optional traffic capture for replay_traffic.py (see traffic.py)
+    record_cassette = os.getenv('RECORD_CASSETTE')
+    if record_cassette:
+        bot.roblox_api.enable_recording(record_cassette)
+    
+    # SIGUSR1 starts a profiling session (see profiler.py), e.g. kill -USR1 <pid>
+    if hasattr(signal, 'SIGUSR1'):
+        profile_seconds = int(os.getenv('PROFILE_SIGNAL_SECONDS', '30'))
+        
+        def start_profiling(signum, frame):
+            bot.loop.call_soon_threadsafe(bot.profiler.start, profile_seconds, bot.loop)
+        
+        signal.signal(signal.SIGUSR1, start_profiling)
+    
     try:
         print("Starting keilscanner Discord bot...")
         bot.run(token)
@@ -0,0 +1,243 @@
+"""
+Price Matching
+Picks the gamepass (or set of gamepasses) whose price best matches a /getlink or /scanmany target
+"""
+
+import bisect
+from array import array
+from typing import Optional, List, Dict, Any, Sequence, Union
+
+try:
+    import numpy
+except ImportError:  # Optional dependency
+    numpy = None
+
+# Combination search bounds: passes per combination and the largest target it is run for
+MAX_COMBINATION_PASSES = 3
+MAX_COMBINATION_TARGET = 100000
+
+def find_best_price_match(gamepasses: List[Dict[str, Any]], target_price: int) -> Optional[Dict[str, Any]]:
+    """
+    Find the gamepass with the closest price to the target price
+    
+    Args:
+        gamepasses: List of gamepass dictionaries
+        target_price: Target price to match
+    
+    Returns:
+        Dictionary with 'gamepass' and 'accuracy' keys, or None if no suitable match
+    """
+    if not gamepasses:
+        return None
+    
+    best_match = None
+    best_diff = float('inf')
+    
+    for gamepass in gamepasses:
+        if not gamepass.get('price') or gamepass['price'] <= 0:
+            continue
+        
+        price_diff = abs(gamepass['price'] - target_price)
+        
+        # Prefer exact matches, then closer prices
+        if price_diff < best_diff:
+            best_diff = price_diff
+            best_match = {
+                'gamepass': gamepass,
+                'price_diff': price_diff
+            }
+    
+    # Return the best match if it's reasonably close (within 50% of target price)
+    if best_match and best_diff <= (target_price * 0.5):
+        return best_match
+    
+    return None
+
+
+def find_price_combination(gamepasses: List[Dict[str, Any]], target_price: int, tolerance: int = 0,
+                           max_passes: int = MAX_COMBINATION_PASSES) -> Optional[Dict[str, Any]]:
+    """
+    Find the smallest set of gamepasses whose prices add up to the target price
+    
+    A bounded subset-sum over the reachable totals: layer j is a bitset (a Python int)
+    of the totals that exactly j distinct passes can make, capped at target + tolerance.
+    Passes priced above the cap, and copies of a price beyond what could fit, are pruned
+    before the search. Each total remembers the pass that first reached it, which is
+    enough to walk a combination back out.
+    
+    Args:
+        gamepasses: List of gamepass dictionaries
+        target_price: Target total price
+        tolerance: Largest accepted difference between the total and the target
+        max_passes: Most passes in one combination
+    
+    Returns:
+        Dictionary with 'gamepasses' (cheapest first), 'total' and 'price_diff' keys for
+        the combination with the fewest passes (the closest total among those), or None
+    """
+    if target_price <= 0 or target_price > MAX_COMBINATION_TARGET:
+        return None
+    
+    low = max(1, target_price - tolerance)
+    cap = target_price + tolerance
+    
+    # Prune passes that can never be part of a combination
+    candidates = []
+    copies: Dict[int, int] = {}
+    for gamepass in sorted(gamepasses, key=lambda gp: gp.get('price') or 0):
+        price = gamepass.get('price')
+        if not price or price <= 0 or price > cap:
+            continue
+        if copies.get(price, 0) >= min(max_passes, cap // price):
+            continue
+        copies[price] = copies.get(price, 0) + 1
+        candidates.append(gamepass)
+    
+    if not candidates:
+        return None
+    
+    mask = (1 << (cap + 1)) - 1
+    window = mask ^ ((1 << low) - 1)
+    layers = [1] + [0] * max_passes
+    first_reached: List[List[tuple]] = [[] for _ in range(max_passes + 1)]
+    
+    for index, gamepass in enumerate(candidates):
+        price = gamepass['price']
+        # Downwards, so a pass is added at most once per combination
+        for count in range(min(max_passes, index + 1), 0, -1):
+            new = ((layers[count - 1] << price) & mask) & ~layers[count]
+            if new:
+                layers[count] |= new
+                first_reached[count].append((index, new))
+    
+    for count in range(1, max_passes + 1):
+        hits = layers[count] & window
+        if not hits:
+            continue
+        
+        # Closest reachable total, the lower one on a tie
+        total = next(t for diff in range(tolerance + 1) for t in (target_price - diff, target_price + diff)
+                     if t >= low and hits >> t & 1)
+        
+        # Walk back through the pass that first reached each partial total
+        chosen = []
+        remaining = total
+        for layer in range(count, 0, -1):
+            index = next(index for index, new in first_reached[layer] if new >> remaining & 1)
+            chosen.append(candidates[index])
+            remaining -= candidates[index]['price']
+        
+        chosen.reverse()
+        return {
+            'gamepasses': chosen,
+            'total': total,
+            'price_diff': abs(total - target_price)
+        }
+    
+    return None
+
+
+class PriceMatcher:
+    """
+    A catalog's prices in one sorted contiguous array, for answering many price queries at once
+    
+    Build it once per catalog, then pass whole lists of targets: nearest() gives what
+    find_best_price_match would for each target, within() every gamepass inside a
+    window, exact() every gamepass at the price. With NumPy each call is a few
+    vectorized binary searches over all targets; without it the same searches run
+    one target at a time with bisect over an array('q').
+    """
+    
+    def __init__(self, gamepasses: List[Dict[str, Any]], use_numpy: bool = True):
+        # Stable sort, so equal prices keep their catalog order as in find_best_price_match
+        self.gamepasses = sorted((gp for gp in gamepasses if gp.get('price') and gp['price'] > 0),
+                                 key=lambda gp: gp['price'])
+        prices = [gp['price'] for gp in self.gamepasses]
+        self.vectorized = use_numpy and numpy is not None
+        self.prices: Union[Sequence[int], 'numpy.ndarray'] = (
+            numpy.asarray(prices, dtype=numpy.int64) if self.vectorized else array('q', prices)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.gamepasses)
+    
+    def nearest(self, targets: Sequence[int], max_ratio: float = 0.5) -> List[Optional[Dict[str, Any]]]:
+        """
+        Closest gamepass for each target, as find_best_price_match would pick it
+        
+        Args:
+            targets: Target prices
+            max_ratio: Largest accepted difference as a fraction of the target
+        
+        Returns:
+            One {'gamepass', 'price_diff'} dictionary (or None) per target; ties go to
+            the cheaper gamepass, then to the first in catalog order
+        """
+        if not self.gamepasses:
+            return [None] * len(targets)
+        
+        if self.vectorized:
+            indices, diffs = self._nearest_numpy(targets)
+        else:
+            indices, diffs = self._nearest_python(targets)
+        
+        return [
+            {'gamepass': self.gamepasses[index], 'price_diff': diff} if diff <= target * max_ratio else None
+            for target, index, diff in zip(targets, indices, diffs)
+        ]
+    
+    def _nearest_numpy(self, targets: Sequence[int]):
+        prices = self.prices
+        targets = numpy.asarray(targets, dtype=numpy.int64)
+        above = numpy.minimum(numpy.searchsorted(prices, targets, 'left'), len(prices) - 1)
+        below = numpy.maximum(above - 1, 0)
+        # First gamepass at the lower neighbour's price
+        below = numpy.searchsorted(prices, prices[below], 'left')
+        below_diff = numpy.abs(prices[below] - targets)
+        above_diff = numpy.abs(prices[above] - targets)
+        take_below = below_diff <= above_diff
+        indices = numpy.where(take_below, below, above)
+        diffs = numpy.where(take_below, below_diff, above_diff)
+        return indices.tolist(), diffs.tolist()
+    
+    def _nearest_python(self, targets: Sequence[int]):
+        prices = self.prices
+        last = len(prices) - 1
+        indices, diffs = [], []
+        for target in targets:
+            above = min(bisect.bisect_left(prices, target), last)
+            below = bisect.bisect_left(prices, prices[max(above - 1, 0)])
+            below_diff, above_diff = abs(prices[below] - target), abs(prices[above] - target)
+            if below_diff <= above_diff:
+                indices.append(below)
+                diffs.append(below_diff)
+            else:
+                indices.append(above)
+                diffs.append(above_diff)
+        return indices, diffs
+    
+    def within(self, targets: Sequence[int], tolerances: Union[int, Sequence[int]]) -> List[List[Dict[str, Any]]]:
+        """
+        Every gamepass priced within each target's tolerance, cheapest first
+        
+        Args:
+            targets: Target prices
+            tolerances: One tolerance for every target, or one per target
+        """
+        if isinstance(tolerances, int):
+            tolerances = [tolerances] * len(targets)
+        
+        if self.vectorized:
+            targets = numpy.asarray(targets, dtype=numpy.int64)
+            tolerances = numpy.asarray(tolerances, dtype=numpy.int64)
+            starts = numpy.searchsorted(self.prices, targets - tolerances, 'left').tolist()
+            ends = numpy.searchsorted(self.prices, targets + tolerances, 'right').tolist()
+        else:
+            starts = [bisect.bisect_left(self.prices, target - tolerance) for target, tolerance in zip(targets, tolerances)]
+            ends = [bisect.bisect_right(self.prices, target + tolerance) for target, tolerance in zip(targets, tolerances)]
+        
+        return [self.gamepasses[start:end] for start, end in zip(starts, ends)]
+    
+    def exact(self, targets: Sequence[int]) -> List[List[Dict[str, Any]]]:
+        """Every gamepass priced exactly at each target"""
+        return self.within(targets, 0)
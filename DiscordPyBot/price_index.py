@@ -0,0 +1,143 @@
+"""
+Price Index
+Global inverted index from price to gamepasses across every catalog RobloxAPI has fetched
+"""
+
+import bisect
+import sys
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Tuple
+
+# Compact row per indexed gamepass: (price, gamepass id, creator id, name)
+Row = Tuple[int, int, Any, str]
+
+# Bytes per row besides its name: the row tuple, its dict slot and id key, and its slot in the sorted keys
+ROW_OVERHEAD = 200
+
+class PriceIndex:
+    """
+    Compact (price, gamepass id, creator, name) rows, sorted by price, with per-creator bookkeeping
+    
+    Catalogs are indexed as they are fetched or refreshed; re-indexing a creator only
+    touches the rows that were added, removed or re-priced. Range queries are a binary
+    search plus a slice, so /findprice never needs an upstream call. Only the fields the
+    index answers with are kept, never the catalog's gamepass dictionaries, and the
+    estimated size is bounded by max_bytes: when it (or max_creators) is exceeded, the
+    creator indexed longest ago is dropped.
+    """
+    
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_creators: int = 50000):
+        self.max_bytes = max_bytes
+        self.max_creators = max_creators
+        self.resident_bytes = 0
+        self._keys: List[Row] = []  # Sorted rows; ids are unique, so rows order by (price, id)
+        self._rows: Dict[int, Row] = {}
+        self._creators: 'OrderedDict[Any, Tuple[Optional[str], Tuple[int, ...]]]' = OrderedDict()  # creator -> (name, gamepass ids)
+    
+    def update_creator(self, creator_id: Any, gamepasses: List[Dict[str, Any]]):
+        """
+        Replace a creator's indexed gamepasses with a fresh catalog
+        
+        Args:
+            creator_id: Roblox user ID of the creator
+            gamepasses: The creator's full current catalog
+        """
+        _, old_ids = self._creators.pop(creator_id, (None, ()))
+        new_ids = {}
+        creator_name = None
+        
+        for gamepass in gamepasses:
+            gamepass_id, price = gamepass.get('id'), gamepass.get('price')
+            if gamepass_id is None or not price or gamepass_id in new_ids:
+                continue
+            
+            creator_name = creator_name or gamepass.get('creatorName')
+            row = (price, gamepass_id, creator_id, gamepass.get('name') or '')
+            new_ids[gamepass_id] = None
+            
+            if self._rows.get(gamepass_id) != row:
+                self._remove_row(gamepass_id)
+                self._add_row(row)
+        
+        for gamepass_id in old_ids:
+            if gamepass_id not in new_ids:
+                self._remove_row(gamepass_id)
+        
+        self._creators[creator_id] = (creator_name, tuple(new_ids))
+        
+        while len(self._creators) > 1 and (len(self._creators) > self.max_creators or
+                                           self.resident_bytes > self.max_bytes):
+            stale_creator = next(iter(self._creators))
+            self.remove_creator(stale_creator)
+    
+    def remove_creator(self, creator_id: Any):
+        """Drop every gamepass of a creator from the index"""
+        _, gamepass_ids = self._creators.pop(creator_id, (None, ()))
+        for gamepass_id in gamepass_ids:
+            self._remove_row(gamepass_id)
+    
+    def _add_row(self, row: Row):
+        self._rows[row[1]] = row
+        bisect.insort(self._keys, row)
+        self.resident_bytes += ROW_OVERHEAD + sys.getsizeof(row[3])
+    
+    def _remove_row(self, gamepass_id: int):
+        row = self._rows.pop(gamepass_id, None)
+        if row is None:
+            return
+        
+        index = bisect.bisect_left(self._keys, row)
+        if index < len(self._keys) and self._keys[index] is row:
+            del self._keys[index]
+        self.resident_bytes -= ROW_OVERHEAD + sys.getsizeof(row[3])
+    
+    def _to_gamepass(self, row: Row) -> Dict[str, Any]:
+        """Expand a row into the gamepass dictionary shape used elsewhere"""
+        price, gamepass_id, creator_id, name = row
+        creator_name, _ = self._creators.get(creator_id, (None, ()))
+        return {
+            'id': gamepass_id,
+            'name': name,
+            'price': price,
+            'creatorId': creator_id,
+            'creatorName': creator_name
+        }
+    
+    def query(self, min_price: int, max_price: Optional[int] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Find gamepasses priced within a range, cheapest first
+        
+        Args:
+            min_price: Lowest price to include
+            max_price: Highest price to include, defaults to min_price (exact match)
+            limit: Maximum number of results
+        
+        Returns:
+            List of gamepass dictionaries with id, name, price, creatorId and creatorName
+        """
+        if max_price is None:
+            max_price = min_price
+        
+        start = bisect.bisect_left(self._keys, (min_price, float('-inf')))
+        end = bisect.bisect_right(self._keys, (max_price, float('inf')), lo=start)
+        return [self._to_gamepass(row) for row in self._keys[start:min(end, start + limit)]]
+    
+    def creator_gamepasses(self, creator_id: Any) -> List[Dict[str, Any]]:
+        """A creator's indexed gamepasses, cheapest first"""
+        _, gamepass_ids = self._creators.get(creator_id, (None, ()))
+        return [self._to_gamepass(row) for row in sorted(self._rows[gamepass_id] for gamepass_id in gamepass_ids)]
+    
+    def count(self, min_price: int, max_price: Optional[int] = None) -> int:
+        """Number of indexed gamepasses priced within a range"""
+        if max_price is None:
+            max_price = min_price
+        start = bisect.bisect_left(self._keys, (min_price, float('-inf')))
+        return bisect.bisect_right(self._keys, (max_price, float('inf')), lo=start) - start
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'gamepasses': len(self._keys),
+            'creators': len(self._creators),
+            'resident_bytes': self.resident_bytes,
+            'max_bytes': self.max_bytes
+        }
@@ -0,0 +1,182 @@
+"""
+On-Demand Profiler
+Time-boxed CPU, wall-clock and per-command profiling sessions, started from /profile or SIGUSR1
+
+While no session runs nothing is hooked: no profiler, no sampling thread, and
+Profiler.span() returns a shared no-op context manager.
+"""
+
+import cProfile
+import contextlib
+import io
+import json
+import math
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Optional, List, Dict, Any
+
+MAX_SESSION_SECONDS = 300
+
+class _Span:
+    """Times one phase of a command into the active session"""
+    __slots__ = ('timings', 'name', 'started')
+    
+    def __init__(self, timings: Dict[str, List[float]], name: str):
+        self.timings = timings
+        self.name = name
+    
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.timings[self.name].append(time.perf_counter() - self.started)
+        return False
+
+_NO_SPAN = contextlib.nullcontext()
+
+class Profiler:
+    """
+    Runs at most one profiling session at a time
+    
+    A session combines:
+    - a cProfile CPU profile of the event loop thread (time.process_time), saved as .pstats
+    - a wall-clock stack sampler on a helper thread, saved as collapsed stacks for flame graphs
+    - per-phase command timings recorded with span(), saved as .timings.json
+    """
+    
+    def __init__(self, output_dir: str = 'profiles', sample_interval: float = 0.005):
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.active = False
+        self.last_report: Optional[Dict[str, Any]] = None
+        self._cpu: Optional[cProfile.Profile] = None
+        self._samples: Counter = Counter()
+        self._timings: Dict[str, List[float]] = defaultdict(list)
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._target_thread = 0
+        self._started_at = 0.0
+        self._stop_handle = None
+    
+    def span(self, name: str):
+        """Context manager timing a command phase; a no-op while no session is active"""
+        if not self.active:
+            return _NO_SPAN
+        return _Span(self._timings, name)
+    
+    def record(self, name: str, seconds: float):
+        """Record a duration measured by the caller; ignored while no session is active"""
+        if self.active:
+            self._timings[name].append(seconds)
+    
+    def start(self, seconds: float, loop=None) -> bool:
+        """
+        Start a session on the calling (event loop) thread
+        
+        Args:
+            seconds: Session length, capped at MAX_SESSION_SECONDS
+            loop: Event loop used to stop the session automatically
+        
+        Returns:
+            False if a session is already running
+        """
+        if self.active:
+            return False
+        
+        seconds = max(1.0, min(seconds, MAX_SESSION_SECONDS))
+        self.active = True
+        self._samples = Counter()
+        self._timings = defaultdict(list)
+        self._started_at = time.monotonic()
+        self._target_thread = threading.get_ident()
+        
+        self._cpu = cProfile.Profile(time.process_time)
+        self._cpu.enable()
+        
+        self._stop_event.clear()
+        self._sampler = threading.Thread(target=self._sample, name='profiler-sampler', daemon=True)
+        self._sampler.start()
+        
+        if loop is not None:
+            self._stop_handle = loop.call_later(seconds, self.stop)
+        print(f"Profiling for {seconds:.0f}s")
+        return True
+    
+    def _sample(self):
+        while not self._stop_event.wait(self.sample_interval):
+            frame = sys._current_frames().get(self._target_thread)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self._samples[';'.join(reversed(stack))] += 1
+    
+    def stop(self) -> Optional[Dict[str, Any]]:
+        """Stop the running session, write its output files and return a summary"""
+        if not self.active:
+            return None
+        
+        self._cpu.disable()
+        self._stop_event.set()
+        self._sampler.join()
+        if self._stop_handle is not None:
+            self._stop_handle.cancel()
+            self._stop_handle = None
+        self.active = False
+        
+        self.last_report = self._write_report(time.monotonic() - self._started_at)
+        print(f"Profile written to {self.last_report['pstats']}")
+        return self.last_report
+    
+    def _write_report(self, duration: float) -> Dict[str, Any]:
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, time.strftime('profile-%Y%m%d-%H%M%S'))
+        
+        self._cpu.dump_stats(f"{base}.pstats")
+        
+        with open(f"{base}.collapsed", 'w', encoding='utf-8') as f:
+            for stack, count in self._samples.most_common():
+                f.write(f"{stack} {count}\n")
+        
+        timings = {name: summarize_timings(values) for name, values in self._timings.items()}
+        with open(f"{base}.timings.json", 'w', encoding='utf-8') as f:
+            json.dump(timings, f, indent=2)
+        
+        stream = io.StringIO()
+        stats = pstats.Stats(self._cpu, stream=stream)
+        top_functions = [
+            f"{os.path.basename(filename)}:{name} {total_time * 1000:.1f}ms"
+            for (filename, _, name), (_, _, total_time, _, _) in
+            sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:10]
+        ]
+        
+        return {
+            'duration_s': round(duration, 1),
+            'samples': sum(self._samples.values()),
+            'pstats': f"{base}.pstats",
+            'collapsed': f"{base}.collapsed",
+            'timings_file': f"{base}.timings.json",
+            'top_cpu': top_functions,
+            'timings': timings
+        }
+
+def summarize_timings(values: List[float]) -> Dict[str, Any]:
+    """Count, p50, p95 and max of a list of durations, in milliseconds"""
+    ordered = sorted(values)
+    
+    def pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1)] * 1000, 1)
+    
+    return {
+        'count': len(ordered),
+        'p50_ms': pct(50),
+        'p95_ms': pct(95),
+        'max_ms': round(ordered[-1] * 1000, 1)
+    }
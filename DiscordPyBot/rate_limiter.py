@@ -0,0 +1,146 @@
+"""
+Priority Rate Limiter
+Shared request gate for RobloxAPI with interactive, normal and background lanes
+"""
+
+import asyncio
+from collections import deque
+from enum import IntEnum
+from typing import Optional, Dict, Any, Deque, Tuple
+
+class Priority(IntEnum):
+    """Request priority lanes, lower values are served first"""
+    INTERACTIVE = 0  # A user is waiting on the result (/getlink, /scanmany)
+    NORMAL = 1
+    BACKGROUND = 2  # Cache refreshes, prefetching, polling
+
+class RequestPreempted(Exception):
+    """Raised for a queued background request dropped to make room for interactive demand"""
+
+class _Lane:
+    """Waiters and counters for one priority lane"""
+    
+    def __init__(self, weight: int):
+        self.weight = weight
+        self.waiters: Deque[Tuple[asyncio.Future, float]] = deque()
+        self.credit = 0
+        self.served = 0
+        self.preempted = 0
+        self.max_depth = 0
+        self.total_wait = 0.0
+    
+    @property
+    def depth(self) -> int:
+        return len(self.waiters)
+
+class PriorityRateLimiter:
+    """
+    Spaces requests at least min_interval apart and hands out each slot by priority
+    
+    In strict mode the highest non-empty lane always wins. In weighted mode lanes are
+    served by smooth weighted round robin so background work still trickles through
+    while interactive traffic is heavy. Queued background requests are preempted once
+    the interactive lane backs up past preempt_threshold.
+    """
+    
+    DEFAULT_WEIGHTS = {
+        Priority.INTERACTIVE: 8,
+        Priority.NORMAL: 3,
+        Priority.BACKGROUND: 1
+    }
+    
+    def __init__(self, min_interval: float = 0.1, strict: bool = True,
+                 weights: Optional[Dict[Priority, int]] = None, preempt_threshold: int = 5):
+        self.min_interval = min_interval
+        self.strict = strict
+        self.preempt_threshold = preempt_threshold
+        
+        weights = {**self.DEFAULT_WEIGHTS, **(weights or {})}
+        self.lanes: Dict[Priority, _Lane] = {priority: _Lane(weights[priority]) for priority in Priority}
+        
+        self.last_request_time = 0.0
+        self._dispatcher: Optional[asyncio.Task] = None
+    
+    async def acquire(self, priority: Priority = Priority.NORMAL):
+        """
+        Wait for this request's slot
+        
+        Args:
+            priority: Lane to queue the request in
+        
+        Raises:
+            RequestPreempted: If a background request was dropped for interactive demand
+        """
+        loop = asyncio.get_running_loop()
+        lane = self.lanes[Priority(priority)]
+        future = loop.create_future()
+        lane.waiters.append((future, loop.time()))
+        lane.max_depth = max(lane.max_depth, lane.depth)
+        
+        if priority == Priority.INTERACTIVE and lane.depth >= self.preempt_threshold:
+            self._preempt_background()
+        
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        
+        await future
+    
+    def _preempt_background(self):
+        background = self.lanes[Priority.BACKGROUND]
+        while background.waiters:
+            future, _ = background.waiters.popleft()
+            if not future.done():
+                future.set_exception(RequestPreempted("Background request preempted by interactive demand"))
+                background.preempted += 1
+    
+    def _next_lane(self) -> Optional[_Lane]:
+        ready = [lane for lane in self.lanes.values() if lane.waiters]
+        if not ready:
+            return None
+        
+        if self.strict:
+            return ready[0]
+        
+        # Smooth weighted round robin over the lanes that have waiters
+        total = sum(lane.weight for lane in ready)
+        for lane in ready:
+            lane.credit += lane.weight
+        chosen = max(ready, key=lambda lane: lane.credit)
+        chosen.credit -= total
+        return chosen
+    
+    async def _dispatch(self):
+        """Release one waiter per interval until every lane is empty"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            wait = self.last_request_time + self.min_interval - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            
+            lane = self._next_lane()
+            if lane is None:
+                return
+            
+            future, queued_at = lane.waiters.popleft()
+            if future.done():
+                # Cancelled while waiting, the slot goes to the next request
+                continue
+            
+            future.set_result(None)
+            lane.served += 1
+            lane.total_wait += loop.time() - queued_at
+            self.last_request_time = loop.time()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Per-lane queue depth and counters"""
+        return {
+            priority.name.lower(): {
+                'queued': lane.depth,
+                'max_queued': lane.max_depth,
+                'served': lane.served,
+                'preempted': lane.preempted,
+                'avg_wait_ms': round(lane.total_wait / lane.served * 1000, 1) if lane.served else 0.0
+            }
+            for priority, lane in self.lanes.items()
+        }
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Traffic Replay
+Replays the /getlink commands of a recorded cassette against RobloxAPI without network access
+
+Record a cassette by running the bot with RECORD_CASSETTE=/path/to/day.jsonl, then:
+    python replay_traffic.py /path/to/day.jsonl --speed 60
+
+Commands are started at their recorded times divided by --speed, so a day of traffic
+replays in 24 minutes at 60x. Roblox responses keep their recorded latency (scaled by
+--latency-scale), which makes the replay a realistic load test of the limiter, caches
+and matching code.
+"""
+
+import argparse
+import asyncio
+import math
+import time
+from typing import List, Dict, Any
+
+from bot import GETLINK_DEADLINE
+from cogs.getlink import find_gamepass_for_price
+from deadline import Deadline
+from roblox_api import RobloxAPI, calculate_nct_price, calculate_ct_price
+from traffic import load_cassette, ReplayTransport
+
+async def run_getlink(roblox_api: RobloxAPI, username: str, price: int, tax_option: str = None,
+                      combine: bool = False) -> str:
+    """The Roblox side of /getlink (the same code the command runs), returning the outcome"""
+    target_price = calculate_ct_price(price) if tax_option == 'ct' else calculate_nct_price(price)
+    deadline = Deadline(GETLINK_DEADLINE)
+    
+    result = await find_gamepass_for_price(roblox_api, username, target_price, deadline, combine=combine)
+    outcome = result['outcome']
+    if outcome in ('found', 'found_combination', 'no_match') and result['partial']:
+        return f"{outcome}_partial"
+    return outcome
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+async def replay(path: str, speed: float, latency_scale: float) -> Dict[str, Any]:
+    """Replay every recorded /getlink command and return a summary"""
+    requests, commands = load_cassette(path)
+    commands = [command for command in commands if command['name'] == 'getlink']
+    
+    roblox_api = RobloxAPI()
+    roblox_api.transport = ReplayTransport(requests, latency_scale)
+    
+    latencies: List[float] = []
+    outcomes: Dict[str, int] = {}
+    started = time.monotonic()
+    
+    async def run_command(command: Dict[str, Any]):
+        await asyncio.sleep(max(0.0, command['t'] / speed - (time.monotonic() - started)))
+        command_started = time.monotonic()
+        outcome = await run_getlink(roblox_api, **command['args'])
+        latencies.append(time.monotonic() - command_started)
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    
+    try:
+        await asyncio.gather(*(run_command(command) for command in commands))
+    finally:
+        await roblox_api.close()
+    
+    return {
+        'commands': len(commands),
+        'wall_s': round(time.monotonic() - started, 2),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+        'max_ms': round(max(latencies, default=0) * 1000, 1),
+        'outcomes': outcomes,
+        'transport': roblox_api.transport.stats(),
+        'limiter': roblox_api.limiter.stats()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded /getlink traffic without network access")
+    parser.add_argument('cassette', help="Cassette file written with RECORD_CASSETTE")
+    parser.add_argument('--speed', type=float, default=1.0, help="Replay speed multiplier for command arrivals")
+    parser.add_argument('--latency-scale', type=float, default=1.0,
+                        help="Multiplier for recorded Roblox response latency (0 disables it)")
+    args = parser.parse_args()
+    
+    summary = asyncio.run(replay(args.cassette, args.speed, args.latency_scale))
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Result Index
+Bounded map from posted /getlink result messages to the gamepass they link, for scans
+"""
+
+import bisect
+import os
+import struct
+from array import array
+from typing import Optional, Tuple, Dict, Any
+
+# On disk each entry is its message id followed by gamepass id, creator id and price
+_ENTRY = struct.Struct('<QQI')
+_MESSAGE_ID = struct.Struct('<Q')
+_RECORD_SIZE = _MESSAGE_ID.size + _ENTRY.size
+
+class ResultIndex:
+    """
+    Remembers the last max_entries /getlink results by Discord message id
+    
+    Entries live in four parallel arrays (message id, gamepass id, creator id, price)
+    kept sorted by message id, 28 bytes per entry with no per-entry Python objects, so
+    a scan of a result is a binary search instead of a message fetch and a regex over
+    its content. Message ids grow with time, so results almost always append, and the
+    oldest messages are forgotten first, 1% of max_entries at a time. With a path, the
+    index is loaded at startup and can be saved as a flat binary file.
+    """
+    
+    def __init__(self, max_entries: int = 200000, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self._message_ids = array('Q')
+        self._gamepass_ids = array('Q')
+        self._creator_ids = array('Q')
+        self._prices = array('I')
+        self.dirty = False
+        
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        
+        if path:
+            self.load()
+    
+    def _find(self, message_id: int) -> Tuple[int, bool]:
+        """Position of a message id in the sorted arrays and whether it is there"""
+        index = bisect.bisect_left(self._message_ids, message_id)
+        return index, index < len(self._message_ids) and self._message_ids[index] == message_id
+    
+    def record(self, message_id: int, gamepass_id: int, creator_id: int, price: int):
+        """Remember the gamepass linked by a posted result message"""
+        # Newer than everything indexed, the usual case
+        if not self._message_ids or message_id > self._message_ids[-1]:
+            index, found = len(self._message_ids), False
+        else:
+            index, found = self._find(message_id)
+        if found:
+            self._gamepass_ids[index] = gamepass_id
+            self._creator_ids[index] = creator_id
+            self._prices[index] = price
+        else:
+            self._message_ids.insert(index, message_id)
+            self._gamepass_ids.insert(index, gamepass_id)
+            self._creator_ids.insert(index, creator_id)
+            self._prices.insert(index, price)
+        
+        # Forget the oldest 1% at once, so the arrays are not shifted on every new result
+        excess = len(self._message_ids) - self.max_entries
+        if excess > 0:
+            excess += self.max_entries // 100
+            for column in (self._message_ids, self._gamepass_ids, self._creator_ids, self._prices):
+                del column[:excess]
+        self.dirty = True
+    
+    def get(self, message_id: int) -> Optional[Tuple[int, int, int]]:
+        """(gamepass id, creator id, price) for a result message, or None if it is not indexed"""
+        index, found = self._find(message_id)
+        if not found:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._gamepass_ids[index], self._creator_ids[index], self._prices[index]
+    
+    def load(self):
+        """Load entries from disk, starting empty if the file is missing or unreadable"""
+        if not os.path.exists(self.path):
+            return
+        
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            print(f"Could not load result index from {self.path}: {e}")
+            return
+        
+        for offset in range(0, len(data) - _RECORD_SIZE + 1, _RECORD_SIZE):
+            message_id, = _MESSAGE_ID.unpack_from(data, offset)
+            self.record(message_id, *_ENTRY.unpack_from(data, offset + _MESSAGE_ID.size))
+        self.dirty = False
+    
+    def save(self):
+        """Write entries to disk atomically, oldest first"""
+        if not self.path:
+            return
+        
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                for message_id, gamepass_id, creator_id, price in zip(self._message_ids, self._gamepass_ids,
+                                                                       self._creator_ids, self._prices):
+                    f.write(_MESSAGE_ID.pack(message_id) + _ENTRY.pack(gamepass_id, creator_id, price))
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Could not save result index to {self.path}: {e}")
+    
+    def __len__(self) -> int:
+        return len(self._message_ids)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'entries': len(self._message_ids),
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -5,22 +5,126 @@ Handles all interactions with the Roblox web API
 
 import aiohttp
 import asyncio
+import bisect
+import hashlib
 import math
-from typing import Optional, List, Dict, Any
+import time
+from contextlib import aclosing
+from urllib.parse import urlencode
+from typing import Optional, List, Dict, Any, Callable, AsyncIterator, Tuple
 import json
+from rate_limiter import PriorityRateLimiter, Priority, RequestPreempted
+from deadline import Deadline
+from hedging import Hedger
+from json_codec import get_loads, parse_catalog_page
+from cache import CacheManager, ManagedCache
+from cache_daemon import SharedCacheClient
+from price_index import PriceIndex
+from username_index import UsernameIndex
+from traffic import CassetteRecorder, ReplayTransport
+
+# Page sizes the catalog search accepts for its limit parameter
+CATALOG_PAGE_SIZES = (10, 28, 30, 60, 120)
 
 class RobloxAPI:
     """Handles Roblox API requests with rate limiting and error handling"""
     
-    def __init__(self):
+    def __init__(self, cache_manager: Optional[CacheManager] = None):
         self.base_url = "https://api.roblox.com"
         self.catalog_url = "https://catalog.roblox.com/v1"
         self.users_url = "https://users.roblox.com/v1"
+        self.games_url = "https://games.roblox.com"
+        self.game_passes_url = "https://apis.roblox.com/game-passes/v1"
+        self.thumbnails_url = "https://thumbnails.roblox.com/v1"
         self.session = None
         
-        # Rate limiting
-        self.last_request_time = 0
+        # Rate limiting (shared by every concurrent caller of this client)
         self.min_request_interval = 0.1  # Minimum 100ms between requests
+        self.limiter = PriorityRateLimiter(min_interval=self.min_request_interval)
+        
+        # The users endpoint accepts at most 100 usernames per call, the thumbnails endpoint 100 ids
+        self.max_usernames_per_request = 100
+        self.max_thumbnails_per_request = 100
+        
+        # Hedging between alternative sources. hedge_delay=None uses the primary's p95 latency;
+        # hedges are only fired while no more than hedge_max_queued requests wait on the limiter
+        self.hedge_delay: Optional[float] = None
+        self.hedge_max_queued = 0
+        self.hedger = Hedger()
+        
+        # JSON decoder for response bodies, orjson when installed (see json_codec)
+        self.json_loads = get_loads()
+        
+        # Caches share one memory budget; catalogs cost a request per page to refetch
+        self.cache_manager = cache_manager or CacheManager()
+        self.user_cache = self.cache_manager.create_cache('users', ttl=3600)
+        self.catalog_cache = self.cache_manager.create_cache('catalogs', ttl=300, cost=5.0)
+        self.regional_pricing_cache = self.cache_manager.create_cache('regional_pricing', ttl=3600)
+        self.thumbnail_cache = self.cache_manager.create_cache('thumbnails', ttl=3600)
+        # Games scans for creators whose catalog search came back empty, kept briefly so
+        # repeat lookups do not fan out to every game again
+        self.games_scan_cache = self.cache_manager.create_cache('games_scans', ttl=120)
+        
+        # Validators (ETag, Last-Modified, body hash) and parsed results per page URL,
+        # used to make catalog refreshes conditional
+        self.validator_cache = self.cache_manager.create_cache('page_validators', ttl=86400, cost=2.0)
+        self.conditional_stats = {
+            'conditional_requests': 0,
+            'not_modified': 0,
+            'hash_matches': 0,
+            'bytes_saved': 0,
+            'parses_saved': 0
+        }
+        
+        # Incremental catalog refreshes; an entry expiring from reconcile_cache means the
+        # creator's next refresh is a full fetch that also catches removed gamepasses
+        self.full_reconcile_interval = 3600
+        self.reconcile_cache = self.cache_manager.create_cache('catalog_reconciled', ttl=self.full_reconcile_interval)
+        self.refresh_stats = {
+            'incremental_refreshes': 0,
+            'full_reconciles': 0,
+            'pages_walked': 0,
+            'games_fallbacks': 0
+        }
+        
+        # Catalog paging: the largest page size the search accepts (stepped down if it
+        # rejects one), a cap on items per walk, and whether the next page is requested
+        # while the current one is processed
+        self.catalog_page_size = CATALOG_PAGE_SIZES[-1]
+        self.max_catalog_items = 1200
+        self.catalog_prefetch = True
+        self.pagination_stats = {
+            'walks': 0,
+            'round_trips': 0,
+            'prefetched': 0,
+            'prefetches_discarded': 0,
+            'page_size_fallbacks': 0
+        }
+        
+        # Price -> gamepass index over every catalog fetched by this client
+        self.price_index = PriceIndex()
+        
+        # Resolved usernames ranked by how often they are looked up, for autocomplete
+        self.username_index = UsernameIndex()
+        
+        # Optional second-level cache shared with other bot processes (see cache_daemon)
+        self.shared_cache: Optional[SharedCacheClient] = None
+        
+        # Optional traffic capture to a cassette, or replay from one instead of the network (see traffic)
+        self.recorder: Optional[CassetteRecorder] = None
+        self.transport: Optional[ReplayTransport] = None
+    
+    @classmethod
+    def from_previous(cls, previous: 'RobloxAPI') -> 'RobloxAPI':
+        """
+        Build a client from (possibly reloaded) code that carries over another client's state
+        
+        The session and its connection pool, limiter, caches, indexes, hooks and counters are
+        taken over as they are; attributes only the new code defines keep their defaults.
+        """
+        client = cls(cache_manager=previous.cache_manager)
+        client.__dict__.update(previous.__dict__)
+        return client
     
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session"""
@@ -36,52 +140,144 @@ class RobloxAPI:
             )
         return self.session
     
-    async def _rate_limit(self):
-        """Simple rate limiting to avoid overwhelming the API"""
-        current_time = asyncio.get_event_loop().time()
-        time_since_last = current_time - self.last_request_time
+    def enable_shared_cache(self, socket_path: str):
+        """Use the shared cache daemon at socket_path behind the in-process caches"""
+        self.shared_cache = SharedCacheClient(socket_path)
+    
+    def enable_recording(self, path: str):
+        """Append every request/response pair and recorded command to the cassette at path"""
+        self.recorder = CassetteRecorder(path)
+    
+    def enable_replay(self, path: str, latency_scale: float = 1.0):
+        """Serve every request from the cassette at path instead of the network"""
+        self.transport = ReplayTransport.from_file(path, latency_scale)
+    
+    def record_command(self, name: str, **args: Any):
+        """Record a command invocation on the cassette, if recording"""
+        if self.recorder is not None:
+            self.recorder.record_command(name, args)
+    
+    async def _cache_get(self, cache: ManagedCache, key: Any) -> Any:
+        """Look a key up in the in-process cache, then in the shared cache"""
+        value = cache.get(key)
+        if value is None and self.shared_cache:
+            value = await self.shared_cache.get(f"{cache.name}:{key}")
+            if value is not None:
+                cache.set(key, value)
+        return value
+    
+    async def _cache_get_many(self, cache: ManagedCache, keys: List[Any]) -> Dict[Any, Any]:
+        """Batched _cache_get; keys found in neither cache are left out"""
+        found = {}
+        missing = []
+        for key in keys:
+            value = cache.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                found[key] = value
         
-        if time_since_last < self.min_request_interval:
-            await asyncio.sleep(self.min_request_interval - time_since_last)
+        if missing and self.shared_cache:
+            values = await self.shared_cache.mget([f"{cache.name}:{key}" for key in missing])
+            for key, value in zip(missing, values):
+                if value is not None:
+                    cache.set(key, value)
+                    found[key] = value
         
-        self.last_request_time = asyncio.get_event_loop().time()
+        return found
     
-    async def _make_request(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    async def _cache_set(self, cache: ManagedCache, key: Any, value: Any):
+        """Store a value in the in-process cache and the shared cache"""
+        cache.set(key, value)
+        if self.shared_cache:
+            await self.shared_cache.set(f"{cache.name}:{key}", value, cache.ttl)
+    
+    async def _rate_limit(self, priority: Priority = Priority.NORMAL):
+        """Wait for a request slot in the given priority lane"""
+        await self.limiter.acquire(priority)
+    
+    async def _make_request(self, url: str, params: Optional[Dict[str, Any]] = None,
+                            method: str = 'GET', json_body: Optional[Dict[str, Any]] = None,
+                            priority: Priority = Priority.NORMAL,
+                            deadline: Optional[Deadline] = None,
+                            parse: Optional[Callable[[bytes], Any]] = None,
+                            conditional: bool = False,
+                            on_status: Optional[Callable[[int], None]] = None) -> Optional[Any]:
         """
         Make an HTTP request to the Roblox API with error handling
         
         Args:
             url: Full URL to request
             params: Optional query parameters
+            method: HTTP method, 'GET' or 'POST'
+            json_body: Optional JSON payload for POST requests
+            priority: Limiter lane for this request
+            deadline: Optional command budget; the request is cancelled when it runs out
+            parse: Optional parser for the raw response body, defaults to self.json_loads
+            conditional: Revalidate against the stored validators for this URL; an unchanged
+                page (304 or identical body hash) returns the previously parsed result
+            on_status: Optional callback given the final HTTP status, so callers can tell
+                a rejected request (4xx) from a transient failure
         
         Returns:
-            JSON response as dictionary, or None if request failed
+            Parsed response (a dictionary for plain JSON), or None if request failed
         """
-        await self._rate_limit()
+        request = self._send_request(url, params, method, json_body, priority, parse or self.json_loads, conditional,
+                                     on_status)
+        
+        if deadline is None:
+            return await request
+        
+        return await deadline.run(request)
+    
+    async def _send_request(self, url: str, params: Optional[Dict[str, Any]], method: str,
+                            json_body: Optional[Dict[str, Any]], priority: Priority,
+                            parse: Callable[[bytes], Any], conditional: bool = False,
+                            on_status: Optional[Callable[[int], None]] = None) -> Optional[Any]:
+        """Wait for a limiter slot and perform the request (see _make_request)"""
+        try:
+            await self._rate_limit(priority)
+        except RequestPreempted as e:
+            print(f"Request skipped: {e}")
+            return None
+        
+        page_key = self._page_key(url, params) if conditional else None
+        headers = self._conditional_headers(page_key) if conditional else None
         
         try:
-            session = await self._get_session()
+            status, response_headers, body = await self._fetch(method, url, params, json_body, headers)
+            
+            if status == 304 and page_key:
+                parsed = self._not_modified(page_key)
+                if parsed is not None:
+                    return parsed
+                # Nothing left to serve the 304 from, so ask again unconditionally
+                status, response_headers, body = await self._fetch(method, url, params, json_body)
             
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                elif response.status == 404:
-                    return None  # Not found
-                elif response.status == 429:
-                    # Rate limited, wait and retry once
-                    print("Rate limited by Roblox API, waiting...")
-                    await asyncio.sleep(2)
-                    
-                    async with session.get(url, params=params) as retry_response:
-                        if retry_response.status == 200:
-                            return await retry_response.json()
-                        else:
-                            print(f"Retry failed with status {retry_response.status}")
-                            return None
+            if on_status is not None and status != 429:
+                on_status(status)
+            
+            if status == 200:
+                return self._parse_body(body, parse, page_key, response_headers)
+            elif status == 404:
+                return None  # Not found
+            elif status == 429:
+                # Rate limited, wait and retry once
+                print("Rate limited by Roblox API, waiting...")
+                await asyncio.sleep(2)
+                
+                status, response_headers, body = await self._fetch(method, url, params, json_body)
+                if on_status is not None:
+                    on_status(status)
+                if status == 200:
+                    return self._parse_body(body, parse, page_key, response_headers)
                 else:
-                    print(f"API request failed with status {response.status}")
+                    print(f"Retry failed with status {status}")
                     return None
-                    
+            else:
+                print(f"API request failed with status {status}")
+                return None
+        
         except asyncio.TimeoutError:
             print("Request timed out")
             return None
@@ -89,91 +285,597 @@ class RobloxAPI:
             print(f"Request error: {e}")
             return None
     
-    async def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
+    async def _fetch(self, method: str, url: str, params: Optional[Dict[str, Any]] = None,
+                     json_body: Optional[Dict[str, Any]] = None,
+                     headers: Optional[Dict[str, str]] = None) -> Tuple[int, Any, bytes]:
+        """Perform one HTTP round trip (or replay it) and return (status, headers, body)"""
+        if self.transport is not None:
+            return await self.transport.request(method, url, params, json_body)
+        
+        session = await self._get_session()
+        started = time.monotonic()
+        async with session.request(method, url, params=params, json=json_body, headers=headers) as response:
+            body = await response.read()
+            status, response_headers = response.status, response.headers
+        
+        if self.recorder is not None:
+            self.recorder.record_request(method, url, params, json_body, status, response_headers,
+                                         body, time.monotonic() - started)
+        return status, response_headers, body
+    
+    @staticmethod
+    def _page_key(url: str, params: Optional[Dict[str, Any]]) -> str:
+        """Stable cache key for a page URL and its query parameters"""
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted((k, str(v)) for k, v in params.items()))}"
+    
+    def _conditional_headers(self, page_key: str) -> Optional[Dict[str, str]]:
+        """If-None-Match / If-Modified-Since headers from the stored validators"""
+        validators = self.validator_cache.peek(page_key)
+        if not validators:
+            return None
+        
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        
+        if headers:
+            self.conditional_stats['conditional_requests'] += 1
+        return headers or None
+    
+    def _not_modified(self, page_key: str) -> Optional[Any]:
+        """
+        Serve a 304 response from the stored parse result
+        
+        Validators are looked up with peek like in _conditional_headers, so one that
+        expired in between still serves the 304; the entry is stored again to renew it.
+        Returns None only if the validators were evicted in the meantime.
+        """
+        validators = self.validator_cache.peek(page_key)
+        if validators is None:
+            return None
+        
+        self.validator_cache.set(page_key, validators)
+        self.conditional_stats['not_modified'] += 1
+        self.conditional_stats['bytes_saved'] += validators['size']
+        self.conditional_stats['parses_saved'] += 1
+        return validators['parsed']
+    
+    def _parse_body(self, body: bytes, parse: Callable[[bytes], Any], page_key: Optional[str],
+                    headers: Any) -> Any:
+        """
+        Parse a response body, skipping the parse when it is identical to the stored one
+        
+        Without a page_key this is just parse(body). With one, the body hash is compared to
+        the stored validators and the new validators are stored alongside the parsed result.
+        """
+        if page_key is None:
+            return parse(body)
+        
+        body_hash = hashlib.blake2b(body, digest_size=16).hexdigest()
+        validators = self.validator_cache.peek(page_key)
+        
+        if validators and validators['hash'] == body_hash:
+            self.conditional_stats['hash_matches'] += 1
+            self.conditional_stats['parses_saved'] += 1
+            parsed = validators['parsed']
+        else:
+            parsed = parse(body)
+        
+        self.validator_cache.set(page_key, {
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'hash': body_hash,
+            'size': len(body),
+            'parsed': parsed
+        })
+        return parsed
+    
+    async def get_user_by_username(self, username: str, priority: Priority = Priority.NORMAL,
+                                   deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """
         Get Roblox user data by username
         
         Args:
             username: Roblox username to search for
+            priority: Limiter lane for the request
+            deadline: Optional command budget
         
         Returns:
             User data dictionary with id, name, displayName, etc., or None if not found
         """
+        cached = await self._cache_get(self.user_cache, username.lower())
+        if cached is not None:
+            self.username_index.add(cached['name'])
+            return cached
+        
         url = f"{self.users_url}/usernames/users"
         params = {
             'usernames': username,
             'excludeBannedUsers': 'true'
         }
         
-        response = await self._make_request(url, params)
+        response = await self._make_request(url, params, priority=priority, deadline=deadline)
         
         if response and response.get('data') and len(response['data']) > 0:
-            return response['data'][0]
+            user = response['data'][0]
+            await self._cache_set(self.user_cache, username.lower(), user)
+            self.username_index.add(user['name'])
+            return user
         
         return None
     
-    async def get_user_gamepasses(self, user_id: int) -> List[Dict[str, Any]]:
+    async def get_users_by_usernames(self, usernames: List[str], priority: Priority = Priority.NORMAL,
+                                     deadline: Optional[Deadline] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolve many Roblox usernames with batched users API calls
+        
+        Args:
+            usernames: Roblox usernames to look up
+            priority: Limiter lane for the requests
+            deadline: Optional command budget
+        
+        Returns:
+            Dictionary mapping each lowercased requested username to its user data.
+            Usernames that could not be found are left out.
+        """
+        url = f"{self.users_url}/usernames/users"
+        users = await self._cache_get_many(self.user_cache, [username.lower() for username in usernames])
+        missing = [username for username in usernames if username.lower() not in users]
+        
+        for start in range(0, len(missing), self.max_usernames_per_request):
+            batch = missing[start:start + self.max_usernames_per_request]
+            payload = {
+                'usernames': batch,
+                'excludeBannedUsers': True
+            }
+            
+            response = await self._make_request(url, method='POST', json_body=payload,
+                                                priority=priority, deadline=deadline)
+            
+            if not response or not response.get('data'):
+                continue
+            
+            for user in response['data']:
+                requested = user.get('requestedUsername') or user.get('name')
+                if requested:
+                    users[requested.lower()] = user
+                    await self._cache_set(self.user_cache, requested.lower(), user)
+        
+        for user in users.values():
+            self.username_index.add(user['name'])
+        
+        return users
+    
+    def _has_hedge_budget(self) -> bool:
+        """Whether the limiter is idle enough to spend a request on a hedge"""
+        queued = sum(lane['queued'] for lane in self.limiter.stats().values())
+        return queued <= self.hedge_max_queued
+    
+    async def get_user_gamepasses(self, user_id: int, priority: Priority = Priority.NORMAL,
+                                  deadline: Optional[Deadline] = None, refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Get all gamepasses created by a user
         
+        The catalog search is the source of truth. Only if a complete search finds
+        nothing are the user's games scanned for passes instead; that scan sees just the
+        first 50 public games and 100 passes per game, so its result is never stored as
+        the catalog, only remembered for a couple of minutes in games_scan_cache.
+        
         Args:
             user_id: Roblox user ID
+            priority: Limiter lane for the page requests
+            deadline: Optional command budget; paging stops when it runs out and
+                the gamepasses found so far are returned (deadline.partial is set)
+            refresh: Skip the cached catalog and fetch it again
         
         Returns:
             List of gamepass dictionaries with id, name, price, etc.
         """
+        if not refresh:
+            cached = await self._cache_get(self.catalog_cache, user_id)
+            if cached is not None:
+                return cached
+        
+        gamepasses, _ = await self._fetch_catalog(user_id, priority, deadline)
+        return gamepasses
+    
+    async def _fetch_catalog(self, user_id: int, priority: Priority,
+                             deadline: Optional[Deadline]) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Fetch a creator's catalog, storing it only if it is complete
+        
+        Returns:
+            (gamepasses, complete); complete is False if a page failed, the deadline ran
+            out or the gamepasses came from the games scan
+        """
+        gamepasses, complete = await self._get_catalog_gamepasses(user_id, priority, deadline)
+        
+        # A failed walk is not an empty catalog; only a search that finished with no
+        # results falls back to the games scan
+        if not gamepasses and complete:
+            gamepasses = await self._scan_games(user_id, priority, deadline)
+            complete = False
+        
+        complete = complete and not (deadline and deadline.partial)
+        
+        # Partial catalogs are not worth remembering
+        if gamepasses and complete:
+            await self._store_catalog(user_id, gamepasses)
+        
+        return gamepasses or [], complete
+    
+    async def _scan_games(self, user_id: int, priority: Priority,
+                          deadline: Optional[Deadline]) -> List[Dict[str, Any]]:
+        """Games scan for a creator with no catalog results, cached for games_scan_cache's TTL"""
+        cached = await self._cache_get(self.games_scan_cache, user_id)
+        if cached is not None:
+            return cached
+        
+        if deadline and deadline.expired:
+            return []
+        
+        self.refresh_stats['games_fallbacks'] += 1
+        gamepasses = await self._get_game_gamepasses(user_id, priority, deadline)
+        if gamepasses is None:
+            return []
+        
+        # An empty result is cached too: it is what makes repeat lookups cheap
+        if not (deadline and deadline.partial):
+            await self._cache_set(self.games_scan_cache, user_id, gamepasses)
+        return gamepasses
+    
+    async def _store_catalog(self, user_id: int, gamepasses: List[Dict[str, Any]]):
+        """Cache a creator's complete catalog and update the price index with it"""
+        await self._cache_set(self.catalog_cache, user_id, gamepasses)
+        self.price_index.update_creator(user_id, gamepasses)
+    
+    async def _get_catalog_gamepasses(self, user_id: int, priority: Priority,
+                                      deadline: Optional[Deadline]) -> Tuple[List[Dict[str, Any]], bool]:
+        """Get a user's gamepasses from the catalog search, sorted by price, and whether the walk completed"""
         all_gamepasses = []
-        cursor = ""
-        max_pages = 10  # Prevent infinite loops
-        pages_fetched = 0
-        
-        while pages_fetched < max_pages:
-            url = f"{self.catalog_url}/search/items/details"
-            params = {
-                'Category': 'GamePass',
-                'CreatorTargetId': user_id,
-                'CreatorType': 'User',
-                'SortType': 'Relevance',
-                'limit': 30  # Maximum items per page
-            }
-            
-            if cursor:
-                params['cursor'] = cursor
+        walk: Dict[str, Any] = {}
+        
+        # A catalog we have seen before tells us how large a page is worth asking for
+        known = self.catalog_cache.peek(user_id)
+        expected_items = len(known) + 1 if known else None
+        
+        async with aclosing(self._walk_catalog_pages(user_id, priority, deadline, expected_items=expected_items,
+                                                     walk=walk)) as pages:
+            async for gamepasses in pages:
+                all_gamepasses.extend(gamepasses)
+        
+        # Sort by price for easier matching
+        all_gamepasses.sort(key=lambda x: x.get('price', 0))
+        
+        return all_gamepasses, walk['complete']
+    
+    def _catalog_page_size(self, expected_items: Optional[int]) -> int:
+        """Smallest accepted page size that fits expected_items, never above catalog_page_size"""
+        sizes = [size for size in CATALOG_PAGE_SIZES if size <= self.catalog_page_size]
+        if expected_items is None:
+            return sizes[-1]
+        return sizes[min(bisect.bisect_left(sizes, expected_items), len(sizes) - 1)]
+    
+    async def _fetch_catalog_page(self, user_id: int, sort_type: str, limit: int, cursor: str,
+                                  priority: Priority, deadline: Optional[Deadline],
+                                  on_status: Optional[Callable[[int], None]] = None):
+        """Request one catalog search page; returns (gamepasses, next cursor) or None"""
+        url = f"{self.catalog_url}/search/items/details"
+        params = {
+            'Category': 'GamePass',
+            'CreatorTargetId': user_id,
+            'CreatorType': 'User',
+            'SortType': sort_type,
+            'limit': limit
+        }
+        
+        if cursor:
+            params['cursor'] = cursor
+        
+        self.pagination_stats['round_trips'] += 1
+        return await self._make_request(url, params, priority=priority, deadline=deadline,
+                                        parse=self._parse_catalog_page, conditional=True, on_status=on_status)
+    
+    async def _walk_catalog_pages(self, user_id: int, priority: Priority, deadline: Optional[Deadline],
+                                  sort_type: str = 'Relevance', expected_items: Optional[int] = None,
+                                  walk: Optional[Dict[str, Any]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield the gamepasses on each catalog search page until the last page, max_catalog_items or the deadline
+        
+        As soon as a page's cursor is known the next page is requested, so it is in flight
+        while the caller processes the current one. Consumers that stop early should close
+        the walk (contextlib.aclosing) so an unneeded prefetch is cancelled promptly.
+        
+        Args:
+            user_id: Roblox user ID
+            priority: Limiter lane for the page requests
+            deadline: Optional budget; paging stops when it runs out
+            sort_type: Catalog search sort order
+            expected_items: Roughly how many gamepasses the creator has, if known, so a
+                small catalog is fetched with a page size that fits it
+            walk: Optional dictionary whose 'complete' is set to whether the walk reached
+                the last page (or max_catalog_items, which bounds every walk) rather than
+                stopping at a failed page or the deadline
+        """
+        walk = {} if walk is None else walk
+        walk['complete'] = False
+        self.pagination_stats['walks'] += 1
+        limit = self._catalog_page_size(expected_items)
+        
+        statuses = []
+        page = await self._fetch_catalog_page(user_id, sort_type, limit, "", priority, deadline, statuses.append)
+        
+        # The search answers 400 to a page size it does not accept; step down until one is.
+        # Any other failure (5xx, timeout, preemption) says nothing about the size.
+        while (page is None and statuses and statuses[-1] == 400 and limit > CATALOG_PAGE_SIZES[0]
+               and not (deadline and deadline.partial)):
+            limit = CATALOG_PAGE_SIZES[CATALOG_PAGE_SIZES.index(limit) - 1]
+            self.pagination_stats['page_size_fallbacks'] += 1
+            statuses.clear()
+            page = await self._fetch_catalog_page(user_id, sort_type, limit, "", priority, deadline, statuses.append)
+            if page is not None:
+                self.catalog_page_size = limit
+        
+        items = 0
+        next_page: Optional[asyncio.Task] = None
+        try:
+            while page is not None:
+                # Only the fields we use are pulled out of each item
+                gamepasses, cursor = page
+                items += len(gamepasses)
+                self.refresh_stats['pages_walked'] += 1
+                
+                # Prevent runaway walks by capping the items, not the pages
+                more = bool(cursor) and items < self.max_catalog_items and not (deadline and not deadline.check())
+                if more and self.catalog_prefetch:
+                    next_page = asyncio.create_task(
+                        self._fetch_catalog_page(user_id, sort_type, limit, cursor, priority, deadline)
+                    )
+                    self.pagination_stats['prefetched'] += 1
+                
+                if not more:
+                    walk['complete'] = not cursor or items >= self.max_catalog_items
+                
+                yield gamepasses
+                
+                if not more:
+                    break
+                
+                if next_page is not None:
+                    page = await next_page
+                    next_page = None
+                else:
+                    page = await self._fetch_catalog_page(user_id, sort_type, limit, cursor, priority, deadline)
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+                self.pagination_stats['prefetches_discarded'] += 1
+    
+    async def refresh_user_gamepasses(self, user_id: int, priority: Priority = Priority.BACKGROUND,
+                                      deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        Bring a creator's cached catalog up to date, fetching as little as possible
+        
+        With a cached catalog, pages are walked most-recently-updated first and the walk
+        stops at the first already-known gamepass whose price has not changed; only the
+        delta is merged in. Without one, or once full_reconcile_interval has passed since
+        the last full fetch, the whole catalog is fetched instead so removals are noticed.
+        
+        Args:
+            user_id: Roblox user ID
+            priority: Limiter lane for the page requests
+            deadline: Optional budget for the refresh
+        
+        Returns:
+            Dictionary with 'gamepasses' (the refreshed catalog), 'added', 'removed',
+            'price_changed' (list of (old, new) gamepass pairs) and 'full' (bool, True only
+            when a full fetch walked the whole catalog)
+        """
+        cached = self.catalog_cache.peek(user_id)
+        
+        if cached is None or user_id not in self.reconcile_cache:
+            gamepasses, complete = await self._fetch_catalog(user_id, priority, deadline)
             
-            response = await self._make_request(url, params)
+            if not complete:
+                # A failed or cut-short walk says nothing about removals: merge what was seen
+                # and try the full reconcile again on the next refresh
+                merged = {gamepass['id']: gamepass for gamepass in cached or []}
+                merged.update((gamepass['id'], gamepass) for gamepass in gamepasses)
+                delta = diff_catalogs(cached or [], sorted(merged.values(), key=lambda x: x.get('price', 0)))
+                delta['full'] = False
+                return delta
             
-            if not response or not response.get('data'):
-                break
+            delta = diff_catalogs(cached or [], gamepasses)
+            delta['full'] = True
+            self.reconcile_cache.set(user_id, True)
+            self.refresh_stats['full_reconciles'] += 1
+            return delta
+        
+        known = {gamepass['id']: gamepass for gamepass in cached}
+        updated: Dict[Any, Dict[str, Any]] = {}
+        walk: Dict[str, Any] = {}
+        reached_known = False
+        
+        async with aclosing(self._walk_catalog_pages(user_id, priority, deadline, sort_type='Updated',
+                                                     walk=walk)) as pages:
+            async for page in pages:
+                for gamepass in page:
+                    previous = known.get(gamepass['id'])
+                    if previous is not None and previous['price'] == gamepass['price']:
+                        reached_known = True
+                        continue
+                    updated[gamepass['id']] = gamepass
+                
+                if reached_known:
+                    break
+        
+        gamepasses = [updated.pop(gamepass['id'], gamepass) for gamepass in cached]
+        gamepasses.extend(updated.values())
+        gamepasses.sort(key=lambda x: x.get('price', 0))
+        
+        delta = diff_catalogs(cached, gamepasses)
+        delta['full'] = False
+        self.refresh_stats['incremental_refreshes'] += 1
+        
+        # A walk that failed before reaching a known gamepass may have missed changes,
+        # so the cached catalog is left to expire rather than renewed
+        if reached_known or walk['complete']:
+            await self._store_catalog(user_id, gamepasses)
+        
+        return delta
+    
+    def _parse_catalog_page(self, body: bytes):
+        """Parse a catalog search page with this client's JSON decoder"""
+        return parse_catalog_page(body, self.json_loads)
+    
+    async def _get_game_gamepasses(self, user_id: int, priority: Priority,
+                                   deadline: Optional[Deadline]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get a user's gamepasses by listing their public games and each game's passes, sorted by price
+        
+        Returns:
+            List of gamepass dictionaries, or None if the games list could not be fetched
+        """
+        url = f"{self.games_url}/v2/users/{user_id}/games"
+        params = {
+            'accessFilter': 'Public',
+            'sortOrder': 'Asc',
+            'limit': 50
+        }
+        
+        response = await self._make_request(url, params, priority=priority, deadline=deadline)
+        if response is None:
+            return None
+        if not response.get('data'):
+            return []
+        
+        game_ids = [game['id'] for game in response['data'] if game.get('id')]
+        
+        # Per-game fetches share the limiter and the command's deadline
+        pages = await asyncio.gather(*[
+            self._make_request(f"{self.games_url}/v1/games/{game_id}/game-passes", {'limit': 100},
+                               priority=priority, deadline=deadline, conditional=True)
+            for game_id in game_ids
+        ])
+        
+        all_gamepasses = []
+        for page in pages:
+            if not page or not page.get('data'):
+                continue
             
-            # Process gamepasses from this page
-            for item in response['data']:
-                if item.get('itemType') == 'GamePass' and item.get('price'):
-                    gamepass = {
+            for item in page['data']:
+                if item.get('price'):
+                    all_gamepasses.append({
                         'id': item.get('id'),
                         'name': item.get('name', 'Unknown Gamepass'),
                         'price': item.get('price'),
                         'iconImageId': item.get('iconImageId'),
-                        'creatorId': item.get('creatorTargetId'),
-                        'creatorName': item.get('creatorName')
-                    }
-                    all_gamepasses.append(gamepass)
-            
-            # Check if there are more pages
-            cursor = response.get('nextPageCursor')
-            if not cursor:
-                break
-            
-            pages_fetched += 1
+                        'creatorId': user_id,
+                        'creatorName': item.get('sellerName')
+                    })
         
-        # Sort by price for easier matching
         all_gamepasses.sort(key=lambda x: x.get('price', 0))
         
         return all_gamepasses
     
+    async def check_regional_pricing(self, gamepass_id: int, priority: Priority = Priority.NORMAL,
+                                     deadline: Optional[Deadline] = None) -> Optional[bool]:
+        """
+        Check whether a gamepass has regional pricing enabled
+        
+        The game-passes product info endpoint is the primary source, hedged with the
+        catalog item details endpoint.
+        
+        Args:
+            gamepass_id: Roblox gamepass ID
+            priority: Limiter lane for the requests
+            deadline: Optional command budget
+        
+        Returns:
+            True or False, or None if neither source could answer
+        """
+        cached = await self._cache_get(self.regional_pricing_cache, gamepass_id)
+        if cached is not None:
+            return cached
+        
+        async def product_info() -> Optional[bool]:
+            url = f"{self.game_passes_url}/game-passes/{gamepass_id}/product-info"
+            data = await self._make_request(url, priority=priority, deadline=deadline)
+            return None if data is None else bool(data.get('IsRegionalPricingEnabled', False))
+        
+        async def catalog_details() -> Optional[bool]:
+            url = f"{self.catalog_url}/catalog/items/{gamepass_id}/details"
+            data = await self._make_request(url, priority=priority, deadline=deadline)
+            if data is None:
+                return None
+            return bool((data.get('priceConfiguration') or {}).get('hasRegionalPricing', False))
+        
+        regional_pricing = await self.hedger.run(
+            'regional_pricing',
+            product_info,
+            catalog_details,
+            is_valid=lambda result: result is not None,
+            delay=self.hedge_delay,
+            has_budget=self._has_hedge_budget
+        )
+        
+        if regional_pricing is not None:
+            await self._cache_set(self.regional_pricing_cache, gamepass_id, regional_pricing)
+        
+        return regional_pricing
+    
+    async def get_gamepass_icons(self, gamepass_ids: List[int], priority: Priority = Priority.NORMAL,
+                                 deadline: Optional[Deadline] = None) -> Dict[int, str]:
+        """
+        Resolve gamepass icons to CDN image URLs with batched thumbnails API calls
+        
+        Args:
+            gamepass_ids: Roblox gamepass IDs
+            priority: Limiter lane for the requests
+            deadline: Optional command budget
+        
+        Returns:
+            Dictionary mapping gamepass ID to image URL. Icons that are missing or still
+            being rendered are left out (and not cached).
+        """
+        gamepass_ids = list(dict.fromkeys(gamepass_ids))
+        icons = await self._cache_get_many(self.thumbnail_cache, gamepass_ids)
+        missing = [gamepass_id for gamepass_id in gamepass_ids if gamepass_id not in icons]
+        
+        url = f"{self.thumbnails_url}/game-passes"
+        batches = [missing[start:start + self.max_thumbnails_per_request]
+                   for start in range(0, len(missing), self.max_thumbnails_per_request)]
+        
+        responses = await asyncio.gather(*[
+            self._make_request(url, {
+                'gamePassIds': ','.join(str(gamepass_id) for gamepass_id in batch),
+                'size': '150x150',
+                'format': 'Png',
+                'isCircular': 'false'
+            }, priority=priority, deadline=deadline)
+            for batch in batches
+        ])
+        
+        for response in responses:
+            for thumbnail in (response or {}).get('data') or ():
+                if thumbnail.get('state') == 'Completed' and thumbnail.get('imageUrl'):
+                    icons[thumbnail['targetId']] = thumbnail['imageUrl']
+                    await self._cache_set(self.thumbnail_cache, thumbnail['targetId'], thumbnail['imageUrl'])
+        
+        return icons
+    
     async def close(self):
         """Close the aiohttp session"""
         if self.session and not self.session.closed:
             await self.session.close()
+        if self.shared_cache:
+            await self.shared_cache.close()
+        if self.recorder:
+            self.recorder.close()
     
     async def __aenter__(self):
         """Async context manager entry"""
@@ -183,6 +885,32 @@ class RobloxAPI:
         """Async context manager exit"""
         await self.close()
 
+def diff_catalogs(old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compare two versions of a creator's catalog
+    
+    Args:
+        old: Previously cached gamepasses
+        new: Refreshed gamepasses
+    
+    Returns:
+        Dictionary with 'gamepasses' (new), 'added', 'removed' and 'price_changed'
+        (list of (old, new) gamepass pairs)
+    """
+    old_by_id = {gamepass['id']: gamepass for gamepass in old}
+    new_by_id = {gamepass['id']: gamepass for gamepass in new}
+    
+    return {
+        'gamepasses': new,
+        'added': [gamepass for gamepass_id, gamepass in new_by_id.items() if gamepass_id not in old_by_id],
+        'removed': [gamepass for gamepass_id, gamepass in old_by_id.items() if gamepass_id not in new_by_id],
+        'price_changed': [
+            (old_by_id[gamepass_id], gamepass)
+            for gamepass_id, gamepass in new_by_id.items()
+            if gamepass_id in old_by_id and old_by_id[gamepass_id]['price'] != gamepass['price']
+        ]
+    }
+
 # Utility functions for price calculations
 def calculate_nct_price(input_price: int) -> int:
     """
@@ -210,6 +938,23 @@ def calculate_ct_price(input_price: int) -> int:
     """
     return input_price
 
+def nct_input_price(gamepass_price: int) -> int:
+    """
+    Inverse of calculate_nct_price
+    
+    Args:
+        gamepass_price: Price of an existing gamepass
+    
+    Returns:
+        The smallest NCT price a buyer would enter to be matched to that gamepass
+    """
+    input_price = math.ceil(gamepass_price / 0.7)
+    while input_price > 1 and calculate_nct_price(input_price - 1) >= gamepass_price:
+        input_price -= 1
+    while calculate_nct_price(input_price) < gamepass_price:
+        input_price += 1
+    return input_price
+
 def format_price_explanation(tax_option: str, input_price: int, target_price: int) -> str:
     """
     Create a formatted explanation of the price calculation
@@ -0,0 +1,235 @@
+"""
+Command Scheduler
+Fair admission control in front of the slash command callbacks
+"""
+
+import asyncio
+import itertools
+from collections import defaultdict
+from typing import Optional, List, Dict, Any, Callable, Awaitable
+
+class SchedulerBusy(Exception):
+    """Raised when a command is shed instead of being queued or run"""
+
+class Ticket:
+    """A command's place in the scheduler, used as an async context manager"""
+    
+    def __init__(self, scheduler: 'CommandScheduler', guild_key: str, user_id: int, tag: float, seq: int):
+        self.scheduler = scheduler
+        self.guild_key = guild_key
+        self.user_id = user_id
+        self.tag = tag  # Virtual finish time used for weighted fair queuing
+        self.seq = seq
+        self.running = False
+        self.released = False
+        self._admitted = asyncio.Event()
+        self._changed = asyncio.Event()
+    
+    @property
+    def position(self) -> int:
+        """1-based position in the queue, or 0 once the command is running"""
+        if self.running:
+            return 0
+        return self.scheduler.position_of(self)
+    
+    async def wait(self, on_position: Optional[Callable[[int], Awaitable[None]]] = None):
+        """
+        Wait until the scheduler lets this command run
+        
+        Args:
+            on_position: Optional callback awaited whenever the queue position changes
+        
+        Raises:
+            SchedulerBusy: If the command waited longer than the scheduler's max_wait
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.scheduler.max_wait
+        last_position = None
+        
+        try:
+            while not self._admitted.is_set():
+                position = self.position
+                if on_position and position and position != last_position:
+                    await on_position(position)
+                last_position = position
+                
+                self._changed.clear()
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise SchedulerBusy("Timed out waiting in the queue")
+                
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self.release()
+            raise
+    
+    def release(self):
+        """Give the slot back (or leave the queue); safe to call more than once"""
+        if not self.released:
+            self.released = True
+            self.scheduler._release(self)
+    
+    async def __aenter__(self):
+        await self.wait()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+class CommandScheduler:
+    """
+    Per-user and per-guild concurrency caps with weighted fair queuing between guilds
+    
+    Each guild gets a virtual clock: a queued command is tagged with the time it would
+    finish if its guild only received its weighted share, and the eligible command with
+    the smallest tag runs next. A guild flooding the queue therefore only pushes its own
+    later commands back.
+    """
+    
+    def __init__(self, max_concurrent: int = 4, per_guild_limit: int = 2, per_user_limit: int = 1,
+                 max_queue: int = 50, max_guild_queue: int = 10, max_wait: float = 600.0,
+                 guild_weights: Optional[Dict[int, float]] = None):
+        self.max_concurrent = max_concurrent
+        self.per_guild_limit = per_guild_limit
+        self.per_user_limit = per_user_limit
+        self.max_queue = max_queue
+        self.max_guild_queue = max_guild_queue
+        self.max_wait = max_wait  # Interaction tokens expire after 15 minutes
+        self.guild_weights = guild_weights or {}
+        
+        self._queue: List[Ticket] = []
+        self._running = 0
+        self._guild_running: Dict[str, int] = defaultdict(int)
+        self._user_running: Dict[int, int] = defaultdict(int)
+        self._guild_queued: Dict[str, int] = defaultdict(int)
+        self._guild_finish: Dict[str, float] = defaultdict(float)
+        self._virtual_time = 0.0
+        self._seq = itertools.count()
+        
+        # Metrics
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+    
+    @staticmethod
+    def _guild_key(guild_id: Optional[int], user_id: int) -> str:
+        # Commands used outside a guild are queued as their own "guild"
+        return f"guild:{guild_id}" if guild_id is not None else f"dm:{user_id}"
+    
+    def _weight(self, guild_id: Optional[int]) -> float:
+        return max(0.01, self.guild_weights.get(guild_id, 1.0))
+    
+    def _eligible(self, guild_key: str, user_id: int) -> bool:
+        return (self._running < self.max_concurrent and
+                self._guild_running[guild_key] < self.per_guild_limit and
+                self._user_running[user_id] < self.per_user_limit)
+    
+    def submit(self, guild_id: Optional[int], user_id: int, cost: float = 1.0) -> Ticket:
+        """
+        Admit a command, either running it immediately or placing it in the queue
+        
+        Args:
+            guild_id: Guild the command was used in, or None for DMs
+            user_id: User who ran the command
+            cost: Relative cost of the command, e.g. the number of creators it scans
+        
+        Returns:
+            Ticket to wait on and release when the command finishes
+        
+        Raises:
+            SchedulerBusy: If the queue is full and the command was shed
+        """
+        guild_key = self._guild_key(guild_id, user_id)
+        
+        start = max(self._virtual_time, self._guild_finish[guild_key])
+        tag = start + cost / self._weight(guild_id)
+        ticket = Ticket(self, guild_key, user_id, tag, next(self._seq))
+        
+        if not self._queue and self._eligible(guild_key, user_id):
+            # The clock follows immediate starts too, so uncontended use is not held against a guild later
+            self._virtual_time = start
+            self._guild_finish[guild_key] = tag
+            self._start(ticket)
+            return ticket
+        
+        if len(self._queue) >= self.max_queue:
+            self.shed += 1
+            raise SchedulerBusy("The bot is handling too many requests right now")
+        if self._guild_queued[guild_key] >= self.max_guild_queue:
+            self.shed += 1
+            raise SchedulerBusy("This server already has too many requests waiting")
+        
+        self._guild_finish[guild_key] = tag
+        self._queue.append(ticket)
+        self._guild_queued[guild_key] += 1
+        self.queued += 1
+        self._dispatch()
+        return ticket
+    
+    def position_of(self, ticket: Ticket) -> int:
+        """1-based position of a queued ticket in fair-queuing order"""
+        ahead = sum(1 for other in self._queue if (other.tag, other.seq) < (ticket.tag, ticket.seq))
+        return ahead + 1
+    
+    def _start(self, ticket: Ticket):
+        ticket.running = True
+        self._running += 1
+        self._guild_running[ticket.guild_key] += 1
+        self._user_running[ticket.user_id] += 1
+        self.admitted += 1
+        ticket._admitted.set()
+        ticket._changed.set()
+    
+    def _dispatch(self):
+        """Start as many queued commands as the caps allow, smallest virtual finish time first"""
+        started = False
+        
+        while self._queue and self._running < self.max_concurrent:
+            candidates = [t for t in self._queue if self._eligible(t.guild_key, t.user_id)]
+            if not candidates:
+                break
+            
+            ticket = min(candidates, key=lambda t: (t.tag, t.seq))
+            self._queue.remove(ticket)
+            self._guild_queued[ticket.guild_key] -= 1
+            self._virtual_time = max(self._virtual_time, ticket.tag)
+            self._start(ticket)
+            started = True
+        
+        if started:
+            # Positions moved, let the remaining waiters report them
+            for ticket in self._queue:
+                ticket._changed.set()
+    
+    def _release(self, ticket: Ticket):
+        if ticket.running:
+            ticket.running = False
+            self._running -= 1
+            self._guild_running[ticket.guild_key] -= 1
+            self._user_running[ticket.user_id] -= 1
+        elif ticket in self._queue:
+            self._queue.remove(ticket)
+            self._guild_queued[ticket.guild_key] -= 1
+        
+        if not self._guild_running[ticket.guild_key] and not self._guild_queued[ticket.guild_key]:
+            self._guild_running.pop(ticket.guild_key, None)
+            self._guild_queued.pop(ticket.guild_key, None)
+            # An idle guild restarts at the current virtual time
+            self._guild_finish.pop(ticket.guild_key, None)
+        if not self._user_running[ticket.user_id]:
+            self._user_running.pop(ticket.user_id, None)
+        
+        self._dispatch()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Current queue state and counters"""
+        return {
+            'running': self._running,
+            'queued': len(self._queue),
+            'admitted': self.admitted,
+            'queued_total': self.queued,
+            'shed': self.shed
+        }
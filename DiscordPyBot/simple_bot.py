@@ -13,19 +13,17 @@ from typing import Optional, List, Dict, Any
 import os
 from dotenv import load_dotenv
 from roblox_api import RobloxAPI
+from gateway import lean_client_options
 
 # Load environment variables
 load_dotenv()
 
 class SimpleBot(commands.Bot):
     def __init__(self):
-        intents = discord.Intents.default()
-        intents.message_content = True
-        
         super().__init__(
             command_prefix='!',
-            intents=intents,
-            description='KeilScanner - Find Roblox gamepasses with tax calculations'
+            description='KeilScanner - Find Roblox gamepasses with tax calculations',
+            **lean_client_options()
         )
         
         # Initialize Roblox API
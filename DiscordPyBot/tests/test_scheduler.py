@@ -0,0 +1,50 @@
+"""
+Scheduler Tests
+Fair queuing between guilds in CommandScheduler
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import CommandScheduler
+
+GUILD_A = 1
+GUILD_B = 2
+
+def dispatch_order(scheduler: CommandScheduler, tickets: list) -> str:
+    """Release running tickets one at a time and record which guild ran next"""
+    guilds = {id(ticket): 'A' if ticket.guild_key == f"guild:{GUILD_A}" else 'B' for ticket in tickets}
+    order = ''
+    pending = list(tickets)
+    while pending:
+        running = next(ticket for ticket in pending if ticket.running)
+        order += guilds[id(running)]
+        pending.remove(running)
+        running.release()
+    return order
+
+def test_uncontended_history_does_not_starve_a_guild():
+    scheduler = CommandScheduler(max_concurrent=1, per_guild_limit=1, max_queue=50, max_guild_queue=10)
+    
+    # Guild A uses the bot alone for a while
+    for user_id in range(50):
+        scheduler.submit(GUILD_A, user_id).release()
+    
+    # Then both guilds queue behind a running command
+    blocker = scheduler.submit(3, 999)
+    tickets = []
+    for index in range(5):
+        tickets.append(scheduler.submit(GUILD_A, 100 + index))
+        tickets.append(scheduler.submit(GUILD_B, 200 + index))
+    blocker.release()
+    
+    assert dispatch_order(scheduler, tickets) == 'ABABABABAB'
+
+def test_idle_guild_keeps_no_finish_tag():
+    scheduler = CommandScheduler(max_concurrent=1)
+    
+    scheduler.submit(GUILD_A, 1).release()
+    
+    assert not scheduler._guild_finish
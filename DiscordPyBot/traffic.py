@@ -0,0 +1,151 @@
+"""
+Traffic Recording
+Record sanitized Roblox API traffic to a cassette file and replay it without network access
+
+A cassette is a JSON-lines file. Each line is either a request/response pair:
+    {"type": "request", "t": 12.5, "method": "GET", "url": ..., "params": {...}, "json": null,
+     "status": 200, "headers": {...}, "body": "...", "elapsed": 0.183}
+or a command invocation, used to drive replays:
+    {"type": "command", "t": 12.4, "name": "getlink", "args": {...}}
+where t is seconds since recording started.
+"""
+
+import asyncio
+import json
+import time
+from collections import defaultdict, deque
+from urllib.parse import urlencode
+from typing import Optional, List, Dict, Any, Tuple
+
+# Only these response headers are kept; everything else (cookies, tracing ids) is dropped
+RECORDED_HEADERS = ('ETag', 'Last-Modified', 'Content-Type')
+
+# Query or body fields whose values are replaced before anything is written
+REDACTED_FIELDS = ('cookie', 'token', 'auth', 'key', 'secret', 'password')
+REDACTED = '<redacted>'
+
+def sanitize(values: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Copy of a params or JSON body dictionary with sensitive fields redacted"""
+    if not values:
+        return values
+    return {
+        name: REDACTED if any(field in name.lower() for field in REDACTED_FIELDS) else value
+        for name, value in values.items()
+    }
+
+def request_key(method: str, url: str, params: Optional[Dict[str, Any]], json_body: Optional[Dict[str, Any]]) -> str:
+    """Key used to match a live request to a recorded one"""
+    params = sanitize(params)
+    query = urlencode(sorted((k, str(v)) for k, v in params.items())) if params else ''
+    body = json.dumps(sanitize(json_body), sort_keys=True) if json_body else ''
+    return f"{method} {url}?{query} {body}"
+
+class CassetteRecorder:
+    """Appends sanitized requests and commands to a cassette file as they happen"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.started = time.time()
+        self._file = open(path, 'a', encoding='utf-8', buffering=1)  # Line buffered
+        
+        # Metrics
+        self.requests = 0
+        self.commands = 0
+    
+    def _write(self, record: Dict[str, Any]):
+        record['t'] = round(time.time() - self.started, 3)
+        self._file.write(json.dumps(record) + '\n')
+    
+    def record_request(self, method: str, url: str, params: Optional[Dict[str, Any]],
+                       json_body: Optional[Dict[str, Any]], status: int, headers: Any,
+                       body: bytes, elapsed: float):
+        """Record one request/response pair"""
+        self.requests += 1
+        self._write({
+            'type': 'request',
+            'method': method,
+            'url': url,
+            'params': sanitize(params),
+            'json': sanitize(json_body),
+            'status': status,
+            'headers': {name: headers.get(name) for name in RECORDED_HEADERS if headers.get(name)},
+            'body': body.decode('utf-8', errors='replace'),
+            'elapsed': round(elapsed, 4)
+        })
+    
+    def record_command(self, name: str, args: Dict[str, Any]):
+        """Record a command invocation (without any Discord user or guild ids)"""
+        self.commands += 1
+        self._write({'type': 'command', 'name': name, 'args': args})
+    
+    def close(self):
+        self._file.close()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'commands': self.commands
+        }
+
+def load_cassette(path: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Read a cassette file
+    
+    Returns:
+        (requests, commands), each in recorded order
+    """
+    requests, commands = [], []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            (commands if record.get('type') == 'command' else requests).append(record)
+    return requests, commands
+
+class ReplayTransport:
+    """
+    Answers RobloxAPI requests from recorded responses
+    
+    Requests are matched on method, URL, query parameters and JSON body. Repeated requests
+    get the recorded responses in order, and the last one again once they run out. Each
+    response is delayed by its recorded latency times latency_scale. Unmatched requests
+    get a 404.
+    """
+    
+    def __init__(self, requests: List[Dict[str, Any]], latency_scale: float = 1.0):
+        self.latency_scale = latency_scale
+        self._responses: Dict[str, deque] = defaultdict(deque)
+        for record in requests:
+            key = request_key(record['method'], record['url'], record.get('params'), record.get('json'))
+            self._responses[key].append(record)
+        
+        # Metrics
+        self.served = 0
+        self.misses = 0
+    
+    @classmethod
+    def from_file(cls, path: str, latency_scale: float = 1.0) -> 'ReplayTransport':
+        requests, _ = load_cassette(path)
+        return cls(requests, latency_scale)
+    
+    async def request(self, method: str, url: str, params: Optional[Dict[str, Any]] = None,
+                      json_body: Optional[Dict[str, Any]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """Replay the recorded response for a request as (status, headers, body)"""
+        queue = self._responses.get(request_key(method, url, params, json_body))
+        if not queue:
+            self.misses += 1
+            return 404, {}, b''
+        
+        record = queue.popleft() if len(queue) > 1 else queue[0]
+        self.served += 1
+        
+        if self.latency_scale > 0:
+            await asyncio.sleep(record.get('elapsed', 0) * self.latency_scale)
+        return record['status'], record.get('headers') or {}, record['body'].encode('utf-8')
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'served': self.served,
+            'misses': self.misses
+        }
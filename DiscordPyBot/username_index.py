@@ -0,0 +1,74 @@
+"""
+Username Index
+In-memory prefix index of resolved Roblox usernames for slash-command autocomplete
+"""
+
+import bisect
+from typing import List, Dict
+
+class UsernameIndex:
+    """
+    Sorted array of lowercased usernames with query counts
+    
+    Prefix lookups are a binary search over the sorted array, so autocomplete answers in
+    microseconds and never touches the network. When the index grows past max_names, the
+    least-queried tenth is dropped.
+    """
+    
+    def __init__(self, max_names: int = 100000, max_scan: int = 500):
+        self.max_names = max_names
+        self.max_scan = max_scan  # Prefix matches ranked per lookup
+        self._sorted: List[str] = []
+        self._names: Dict[str, str] = {}  # lowercased -> canonical spelling
+        self._counts: Dict[str, int] = {}
+    
+    def add(self, username: str, queried: bool = True):
+        """
+        Record a username that resolved to a real Roblox user
+        
+        Args:
+            username: Canonical spelling from the users API
+            queried: Count this as a query for ranking
+        """
+        key = username.lower()
+        if key not in self._names:
+            bisect.insort(self._sorted, key)
+            self._counts[key] = 0
+        self._names[key] = username
+        if queried:
+            self._counts[key] += 1
+        
+        if len(self._sorted) > self.max_names:
+            self._prune()
+    
+    def _prune(self):
+        keep = sorted(self._sorted, key=lambda key: self._counts[key], reverse=True)[:int(self.max_names * 0.9)]
+        self._sorted = sorted(keep)
+        self._names = {key: self._names[key] for key in keep}
+        self._counts = {key: self._counts[key] for key in keep}
+    
+    def suggest(self, prefix: str, limit: int = 25) -> List[str]:
+        """
+        Usernames starting with prefix, most queried first
+        
+        Args:
+            prefix: What the user has typed so far (case-insensitive)
+            limit: Maximum number of suggestions
+        
+        Returns:
+            Canonical usernames
+        """
+        prefix = prefix.strip().lower()
+        start = bisect.bisect_left(self._sorted, prefix)
+        candidates = []
+        
+        for key in self._sorted[start:start + self.max_scan]:
+            if not key.startswith(prefix):
+                break
+            candidates.append(key)
+        
+        candidates.sort(key=lambda key: (-self._counts[key], key))
+        return [self._names[key] for key in candidates[:limit]]
+    
+    def __len__(self) -> int:
+        return len(self._sorted)
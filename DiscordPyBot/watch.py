@@ -0,0 +1,186 @@
+"""
+Gamepass Watches
+Persistent /watch subscriptions and the background poller that notifies on matching gamepasses
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import time
+from collections import defaultdict
+from typing import Optional, List, Dict, Any, Callable, Awaitable
+
+from rate_limiter import Priority
+
+class WatchStore:
+    """
+    Watch subscriptions kept in memory and persisted to a local JSON file
+    
+    Each subscription is a dictionary with id, user_id, channel_id, creator_id,
+    creator_name, price, tax_option, target_price and created_at.
+    """
+    
+    def __init__(self, path: str = 'watches.json'):
+        self.path = path
+        self.subscriptions: Dict[int, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self.load()
+    
+    def load(self):
+        """Load subscriptions from disk, starting empty if the file is missing or unreadable"""
+        if not os.path.exists(self.path):
+            return
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not load watches from {self.path}: {e}")
+            return
+        
+        self.subscriptions = {sub['id']: sub for sub in data.get('subscriptions', [])}
+        self._ids = itertools.count(max(self.subscriptions, default=0) + 1)
+    
+    def save(self):
+        """Write subscriptions to disk atomically"""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'subscriptions': list(self.subscriptions.values())}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not save watches to {self.path}: {e}")
+    
+    def add(self, user_id: int, channel_id: Optional[int], creator_id: int, creator_name: str,
+            price: int, tax_option: str, target_price: int) -> Dict[str, Any]:
+        """Register a subscription and persist it"""
+        subscription = {
+            'id': next(self._ids),
+            'user_id': user_id,
+            'channel_id': channel_id,
+            'creator_id': creator_id,
+            'creator_name': creator_name,
+            'price': price,
+            'tax_option': tax_option,
+            'target_price': target_price,
+            'created_at': time.time()
+        }
+        self.subscriptions[subscription['id']] = subscription
+        self.save()
+        return subscription
+    
+    def remove(self, subscription_id: int) -> Optional[Dict[str, Any]]:
+        """Remove a subscription and persist the change"""
+        subscription = self.subscriptions.pop(subscription_id, None)
+        if subscription is not None:
+            self.save()
+        return subscription
+    
+    def for_user(self, user_id: int) -> List[Dict[str, Any]]:
+        return [sub for sub in self.subscriptions.values() if sub['user_id'] == user_id]
+    
+    def by_creator(self) -> Dict[int, List[Dict[str, Any]]]:
+        """Subscriptions grouped by the creator they watch"""
+        grouped = defaultdict(list)
+        for sub in self.subscriptions.values():
+            grouped[sub['creator_id']].append(sub)
+        return grouped
+
+class WatchScheduler:
+    """
+    Polls watched creators in the background and notifies matching subscriptions
+    
+    Each creator is polled once per round no matter how many subscriptions watch it,
+    using the incremental catalog refresh in the background limiter lane. Polls are
+    spaced poll_spacing seconds apart, so a round over N creators takes N * poll_spacing
+    seconds (but at least min_poll_interval) and the polling load stays flat however
+    many creators are watched.
+    """
+    
+    def __init__(self, roblox_api, store: WatchStore,
+                 notify: Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[None]],
+                 poll_spacing: float = 2.0, min_poll_interval: float = 60.0):
+        self.roblox_api = roblox_api
+        self.store = store
+        self.notify = notify
+        self.poll_spacing = poll_spacing
+        self.min_poll_interval = min_poll_interval
+        self._next_poll: Dict[int, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        
+        # Metrics
+        self.polls = 0
+        self.notifications = 0
+    
+    def start(self):
+        """Start the polling loop on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+    
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+    
+    def poll_interval(self) -> float:
+        """Seconds between two polls of the same creator"""
+        return max(self.min_poll_interval, len(self.store.by_creator()) * self.poll_spacing)
+    
+    def _next_due(self) -> Optional[int]:
+        creators = self.store.by_creator()
+        now = time.monotonic()
+        
+        # Forget creators nobody watches any more
+        for creator_id in list(self._next_poll):
+            if creator_id not in creators:
+                del self._next_poll[creator_id]
+        
+        due = [creator_id for creator_id in creators if self._next_poll.get(creator_id, 0) <= now]
+        return min(due, key=lambda creator_id: self._next_poll.get(creator_id, 0)) if due else None
+    
+    async def _run(self):
+        while True:
+            creator_id = self._next_due()
+            if creator_id is not None:
+                self._next_poll[creator_id] = time.monotonic() + self.poll_interval()
+                try:
+                    await self.poll_creator(creator_id)
+                except Exception as e:
+                    print(f"Error polling watched creator {creator_id}: {e}")
+            
+            await asyncio.sleep(self.poll_spacing)
+    
+    async def poll_creator(self, creator_id: int):
+        """Refresh one creator's catalog and notify every subscription it now satisfies"""
+        subscriptions = self.store.by_creator().get(creator_id)
+        if not subscriptions:
+            return
+        
+        delta = await self.roblox_api.refresh_user_gamepasses(creator_id, priority=Priority.BACKGROUND)
+        self.polls += 1
+        
+        # /watch refuses prices that already exist, so any pass at the target price is new
+        by_price = defaultdict(list)
+        for gamepass in delta['gamepasses']:
+            by_price[gamepass['price']].append(gamepass)
+        
+        for subscription in subscriptions:
+            matches = by_price.get(subscription['target_price'])
+            if not matches:
+                continue
+            
+            self.store.remove(subscription['id'])
+            self.notifications += 1
+            try:
+                await self.notify(subscription, matches[0])
+            except Exception as e:
+                print(f"Error sending watch notification {subscription['id']}: {e}")
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'subscriptions': len(self.store.subscriptions),
+            'creators': len(self.store.by_creator()),
+            'poll_interval_s': round(self.poll_interval(), 1),
+            'polls': self.polls,
+            'notifications': self.notifications
+        }
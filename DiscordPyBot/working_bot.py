@@ -11,17 +11,15 @@ import asyncio
 import math
 import os
 from dotenv import load_dotenv
+from gateway import lean_client_options
 
 load_dotenv()
 
 class WorkingBot(commands.Bot):
     def __init__(self):
-        intents = discord.Intents.default()
-        intents.message_content = True
-        
         super().__init__(
             command_prefix='!',
-            intents=intents
+            **lean_client_options()
         )
         
         self.session = None